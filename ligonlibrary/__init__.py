@@ -2,25 +2,49 @@
 
 from importlib.metadata import PackageNotFoundError, version
 
-from .dataframes import (  # noqa: F401
-    df_from_orgfile,
-    df_to_orgtbl,
-    find_similar_pairs,
-    from_dta,
-    get_dataframe,
-    normalize_strings,
-    orgtbl_to_df,
-)
-from .sheets import (  # noqa: F401
-    delete_sheet,
-    get_credentials,
-    read_public_sheet,
-    read_sheets,
-    write_sheet,
-)
-from .strings import most_similar, normalized, similar  # noqa: F401
-from .authinfo import get_password_for_machine  # noqa: F401
-from .email_from_ligon import email_from_ligon  # noqa: F401
+from importlib import import_module
+
+# Bound eagerly: the function shares its submodule's name, and importing the
+# submodule later would otherwise leave the package attribute the module.
+from .email_from_ligon import email_from_ligon
+
+# Public names and the submodule defining each.  Submodules are imported on
+# first access (PEP 562), so e.g. using `normalize_strings` does not pull in
+# gspread and the other Sheets clients behind `sheets`.
+_EXPORTS = {
+    "df_from_orgfile": "dataframes",
+    "df_to_orgtbl": "dataframes",
+    "find_similar_pairs": "dataframes",
+    "from_dta": "dataframes",
+    "get_dataframe": "dataframes",
+    "get_dataframes": "dataframes",
+    "normalize_strings": "dataframes",
+    "orgtbl_to_df": "dataframes",
+    "delete_sheet": "sheets",
+    "get_credentials": "sheets",
+    "read_public_sheet": "sheets",
+    "read_sheets": "sheets",
+    "write_sheet": "sheets",
+    "most_similar": "strings",
+    "normalized": "strings",
+    "similar": "strings",
+    "get_password_for_machine": "authinfo",
+}
+
+
+def __getattr__(name):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
+
 
 try:  # pragma: no cover - fallback during editable installs
     __version__ = version("ligonlibrary")
@@ -34,6 +58,7 @@ __all__ = [
     "find_similar_pairs",
     "from_dta",
     "get_dataframe",
+    "get_dataframes",
     "normalize_strings",
     "orgtbl_to_df",
     # sheets
@@ -1,12 +1,22 @@
 #!/usr/bin/env python3
 
 """Miscellany of tools for manipulating dataframes."""
+import gzip
+import hashlib
 import struct
 import warnings
 from warnings import warn
 from io import BytesIO
+import os
+import shutil
 import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib.util import find_spec
 from pathlib import Path
+from typing import Callable, Dict, Iterable
 
 import numpy as np
 import pandas as pd
@@ -15,14 +25,75 @@ try:
     import magic  # type: ignore
 except ImportError:  # pragma: no cover - optional dependency
     magic = None
-try:
-    from pyarrow.lib import ArrowInvalid
-except ImportError:  # pragma: no cover - optional dependency
-    class ArrowInvalid(Exception):  # type: ignore
-        """Fallback ArrowInvalid when pyarrow is unavailable."""
 
-        pass
-from functools import lru_cache
+# Whether calamine is installed, found without importing it; pandas imports
+# the engine (as it does openpyxl) only when a workbook is read.
+_EXCEL_ENGINE = "calamine" if find_spec("python_calamine") is not None else None
+
+# |t| must exceed each threshold to earn the corresponding star.
+_STAR_THRESHOLDS = np.array([1.65, 1.96, 2.577])
+_STARS = np.array(["", "^{*}", "^{**}", "^{***}"], dtype=object)
+
+
+def _align_to(other, df):
+    """Return the values of *other* at each cell of *df*, column by column.
+
+    Gives a list of one array per column of *df*, holding the scalars that
+    ``other[j][i]`` would, and a boolean array marking the cells *other*
+    has, so callers can tell a missing label (a KeyError) from a missing
+    value.  Entries not found are arbitrary.
+    """
+    nrows, ncols = df.shape
+    if isinstance(other, pd.DataFrame) and other.index.is_unique and other.columns.is_unique:
+        try:
+            rows = other.index.get_indexer(df.index)
+            cols = other.columns.get_indexer(df.columns)
+        except (TypeError, ValueError, pd.errors.InvalidIndexError):
+            pass
+        else:
+            found = np.outer(rows >= 0, cols >= 0)
+            taken = np.where(rows >= 0, rows, 0)
+            columns = []
+            for k in cols:
+                if k < 0 or len(other) == 0:
+                    columns.append(np.full(nrows, None, dtype=object))
+                else:
+                    columns.append(other.iloc[:, k].to_numpy()[taken])
+            return columns, found
+
+    columns = [np.full(nrows, None, dtype=object) for _ in range(ncols)]
+    found = np.zeros((nrows, ncols), dtype=bool)
+    for c, j in enumerate(df.columns):
+        for r, i in enumerate(df.index):
+            try:
+                columns[c][r] = other[j][i]
+            except KeyError:
+                continue
+            found[r, c] = True
+    return columns, found
+
+
+def _index_prefixes(index, levels):
+    """Return the org-table cells that open each row, one string per row.
+
+    With a MultiIndex, a level's label is only printed where it differs
+    from the row above.
+    """
+    if levels == 1:
+        return ["| %s  " % i for i in index]
+    if len(index) == 0:
+        return []
+
+    cells = []
+    for k in range(levels):
+        labels = np.asarray(index.get_level_values(k), dtype=object)
+        previous = np.empty_like(labels)
+        previous[0] = ""
+        previous[1:] = labels[:-1]
+        changed = np.asarray(labels != previous, dtype=bool)
+        cells.append(["| %s " % v if c else "| " for v, c in zip(labels, changed)])
+    return ["".join(row) for row in zip(*cells)]
+
 
 def df_to_orgtbl(
     df,
@@ -33,6 +104,7 @@ def df_to_orgtbl(
     bonus_stats=None,
     math_delimiters=True,
     print_heading=True,
+    skip_validate=False,
 ):
     """
     Return a string that renders *df* as an org-table.
@@ -45,6 +117,8 @@ def df_to_orgtbl(
 
     If tdf is False and sedf is supplied then stars will decorate significant point estimates.
     If tdf is a df of t-statistics stars will decorate significant point estimates.
+
+    Unless skip_validate is True, warn if the index or columns of df contain duplicates.
     """
 
     def is_missing(x):
@@ -76,6 +150,7 @@ def df_to_orgtbl(
             bonus_stats=mypop(bonus_stats, 0),
             math_delimiters=mypop(math_delimiters, 0),
             print_heading=print_heading,
+            skip_validate=skip_validate,
         )
 
         if len(df):
@@ -84,10 +159,10 @@ def df_to_orgtbl(
             else:
                 print_heading = True
 
-            return (
-                current
-                + "|-\n"
-                + df_to_orgtbl(
+            return "".join([
+                current,
+                "|-\n",
+                df_to_orgtbl(
                     df,
                     tdf=tdf,
                     sedf=sedf,
@@ -96,21 +171,23 @@ def df_to_orgtbl(
                     bonus_stats=bonus_stats,
                     math_delimiters=math_delimiters,
                     print_heading=print_heading,
-                )
-            )
+                    skip_validate=skip_validate,
+                ),
+            ])
         else:
             return current
 
-    if len(df.shape) == 1:  # We have a series?
-        df = pd.DataFrame(df)
+    if df.ndim == 1:  # We have a series?
+        df = df.to_frame()
 
-    # Test for duplicates in index
-    if df.index.duplicated().sum() > 0:
-        warn("Dataframe index contains duplicates.")
+    if not skip_validate:
+        # Test for duplicates in index
+        if not df.index.is_unique:
+            warn("Dataframe index contains duplicates.")
 
-    # Test for duplicates in columns
-    if df.columns.duplicated().sum() > 0:
-        warn("Dataframe columns contain duplicates.")
+        # Test for duplicates in columns
+        if not df.columns.is_unique:
+            warn("Dataframe columns contain duplicates.")
 
     try:  # Look for a multiindex
         levels = len(df.index.levels)
@@ -130,23 +207,21 @@ def df_to_orgtbl(
         if collevels == 1:
             s = "| " + " | ".join(names) + " | " + "|   ".join([str(s) for s in df.columns]) + "  |\n|-\n"
         else:
-            colhead = np.array(df.columns.tolist()).T
-            lastcol = [""] * collevels
-            for l, j in enumerate(colhead.T.copy()):
-                for k in range(collevels):
-                    if lastcol[k] == j[k]:
-                        colhead[k, l] = ""
-                lastcol = j
-
-            colhead = colhead.tolist()
-            s = ""
+            # Label a level only where it differs from the column to its left
+            codes = np.asarray(df.columns.codes)
+            changed = np.ones(codes.shape, dtype=bool)
+            changed[:, 1:] = codes[:, 1:] != codes[:, :-1]
+
+            lines = []
             for k in range(collevels):
+                labels = np.array([str(v) for v in df.columns.levels[k]] + ["nan"], dtype=object)  # -1 is missing
                 if k < collevels - 1:
-                    s += "| " * levels + " | "
+                    lines.append("| " * levels + " | ")
                 else:
-                    s += "| " + " | ".join(names) + " | "
-                s += " | ".join(colhead[k]) + "  |\n"
-            s += "|-\n"
+                    lines.append("| " + " | ".join(names) + " | ")
+                lines.append(" | ".join(np.where(changed[k], labels[codes[k]], "")) + "  |\n")
+            lines.append("|-\n")
+            s = "".join(lines)
 
         return s
 
@@ -163,177 +238,151 @@ def df_to_orgtbl(
             except (AttributeError, TypeError):  # stats a dict or series?
                 return " | " + str(stats[i])
 
-    def format_entry(x, stars="", se=False, float_fmt=float_fmt, math_delimiters=math_delimiters):
+    if math_delimiters:
+        prefix, suffix = "| \\(", "\\) "
+    else:
+        prefix, suffix = "| ", " "
+
+    templates = {}  # There are only a handful of (stars, se) combinations
+
+    def entry_template(stars="", se=False):
         try:
+            return templates[stars, se]
+        except KeyError:
             fmt = float_fmt + stars
-            if se:
-                fmt = f"({fmt})"
-            if math_delimiters:
-                entry = "| \\(" + fmt + "\\) "
-            else:
-                entry = "| " + fmt + " "
-            if is_missing(x):
-                return "| --- "
-            else:
-                return entry % x
+            template = templates[stars, se] = prefix + (f"({fmt})" if se else fmt) + suffix
+            return template
+
+    def format_entry(x, stars="", se=False, miss=None):
+        if is_missing(x) if miss is None else miss:
+            return "| --- "
+        try:
+            return entry_template(stars, se) % x
         except TypeError:
             return "| %s " % str(x)
 
-    if print_heading:
-        s = column_heading(df)
-    else:
-        s = ""
-
-    if (tdf is None) and (sedf is None) and (conf_ints is None):
-        lastidx = [""] * levels
-        for i in df.index:
-            if levels == 1:  # Normal index
-                s += "| %s  " % i
-            else:
-                for k in range(levels):
-                    if lastidx[k] != i[k]:
-                        s += "| %s " % i[k]
-                    else:
-                        s += "| "
-            lastidx = i
-
-            for j in df.columns:  # Point estimates
-                s += format_entry(df[j][i])
-            s += "|\n"
-        return s
-    elif not (tdf is None) and (sedf is None) and (conf_ints is None):
-        lastidx = [""] * levels
-        for i in df.index:
-            if levels == 1:  # Normal index
-                s += "| %s  " % i
-            else:
-                for k in range(levels):
-                    if lastidx[k] != i[k]:
-                        s += "| %s " % i[k]
-                    else:
-                        s += "| "
-            lastidx = i
-
-            for j in df.columns:
+    def significance_stars(tdf):
+        """Star decorations for each cell of df, from t-statistics in tdf."""
+        columns, found = _align_to(tdf, df)
+        tvals = np.zeros(df.shape)
+        for c, values in enumerate(columns):
+            tvals[:, c] = pd.to_numeric(pd.Series(values)).to_numpy(dtype=float, na_value=np.nan)
+        tvals[~found | np.isnan(tvals)] = 0
+        # Number of thresholds strictly below |t|, in one pass
+        return _STARS[np.searchsorted(_STAR_THRESHOLDS, np.abs(tvals, out=tvals))]
+
+    def format_estimates(stars=None):
+        """Formatted point estimates of df, one string per row."""
+        if stars is None:
+            stars = np.full(df.shape, "", dtype=object)
+        columns = []
+        for k in range(df.shape[1]):
+            column = df.iloc[:, k]
+            cells = None
+            if isinstance(column.dtype, np.dtype) and column.dtype.kind in "fiu":
+                # Python scalars and flags iterate and format faster than NumPy's, but
+                # only float64 and integers print the same ("%s" of a float32 doesn't)
+                values = column.to_numpy()
+                if values.dtype.kind in "iu" or values.dtype == np.float64:
+                    values = values.tolist()
+                misses, column_stars = missing[:, k].tolist(), stars[:, k].tolist()
+                templates = {star: entry_template(star) for star in set(column_stars)}
                 try:
-                    stars = (np.abs(tdf[j][i]) > 1.65) + 0.0
-                    stars += (np.abs(tdf[j][i]) > 1.96) + 0.0
-                    stars += (np.abs(tdf[j][i]) > 2.577) + 0.0
-                    stars = int(stars)
-                    if stars > 0:
-                        stars = "^{" + "*" * stars + "}"
+                    if len(templates) == 1 and not any(misses):  # One template fits every cell
+                        template, = templates.values()
+                        cells = [template % x for x in values]
                     else:
-                        stars = ""
-                except KeyError:
-                    stars = ""
-                s += format_entry(df[j][i], stars)
+                        cells = ["| --- " if miss else templates[star] % x
+                                 for x, miss, star in zip(values, misses, column_stars)]
+                except TypeError:  # Format doesn't suit values; go cell by cell
+                    cells = None
+            if cells is None:
+                cells = [format_entry(x, star, miss=miss)
+                         for x, miss, star in zip(column.array, missing[:, k], stars[:, k])]
+            columns.append(cells)
+        return ["".join(row) for row in zip(*columns)] if columns else [""] * len(df)
 
-            s += "|\n"
+    prefixes = _index_prefixes(df.index, levels)
+    missing = pd.isna(df).to_numpy()
 
-        return s
+    parts = [column_heading(df)] if print_heading else []
+
+    if (tdf is None) and (sedf is None) and (conf_ints is None):
+        estimates = format_estimates()
+        for r, i in enumerate(df.index):
+            parts += [prefixes[r], estimates[r], "|\n"]  # Point estimates
+        return "".join(parts)
+    elif not (tdf is None) and (sedf is None) and (conf_ints is None):
+        estimates = format_estimates(significance_stars(tdf))
+        for r, i in enumerate(df.index):
+            parts += [prefixes[r], estimates[r], "|\n"]
+        return "".join(parts)
     elif not (sedf is None) and (conf_ints is None):  # Print standard errors on alternate rows
         if tdf is not False:
             try:  # Passed in dataframe?
                 tdf.shape
             except AttributeError:
                 tdf = df[sedf.columns] / sedf
+        estimates = format_estimates(None if tdf is False else significance_stars(tdf))
 
-        lastidx = [""] * levels
-        for i in df.index:
-            if levels == 1:  # Normal index
-                s += "| %s  " % i
-            else:
-                for k in range(levels):
-                    if lastidx[k] != i[k]:
-                        s += "| %s " % i[k]
-                    else:
-                        s += "| "
-            lastidx = i
-
-            for j in df.columns:  # Point estimates
-                if tdf is not False:
-                    try:
-                        stars = (np.abs(tdf[j][i]) > 1.65) + 0.0
-                        stars += (np.abs(tdf[j][i]) > 1.96) + 0.0
-                        stars += (np.abs(tdf[j][i]) > 2.577) + 0.0
-                        stars = int(stars)
-                        if stars > 0:
-                            stars = "^{" + "*" * stars + "}"
-                        else:
-                            stars = ""
-                    except KeyError:
-                        stars = ""
-                else:
-                    stars = ""
-                s += format_entry(df[j][i], stars)
-
-            s += "|\n" + se_linestart(bonus_stats, i)
-            for j in df.columns:  # Now standard errors
-                s += "  "
-                try:
-                    if is_missing(df[j][i]):  # Pt estimate miss
-                        se = ""
-                    elif is_missing(sedf[j][i]):
-                        se = "(---)"
-                    else:
-                        se = format_entry(sedf[j][i], se=True)
-                except KeyError:
-                    se = "|  "
-                s += se
-            s += "|\n"
-        return s
+        se_columns, se_found = _align_to(sedf, df)
+        se_template = entry_template(se=True)
+        cells = []
+        for c, values in enumerate(se_columns):
+            rows = list(zip(values, missing[:, c], se_found[:, c], pd.isna(values)))
+            try:
+                cells.append([
+                    "" if miss  # Pt estimate miss
+                    else "|  " if not found
+                    else "(---)" if se_miss
+                    else se_template % x
+                    for x, miss, found, se_miss in rows])
+            except TypeError:  # Format doesn't suit values; go cell by cell
+                cells.append([
+                    "" if miss
+                    else "|  " if not found
+                    else "(---)" if se_miss
+                    else format_entry(x, se=True, miss=False)
+                    for x, miss, found, se_miss in rows])
+        errors = ["".join("  " + cell for cell in row) for row in zip(*cells)] if cells else [""] * len(df)
+
+        for r, i in enumerate(df.index):
+            parts += [prefixes[r], estimates[r],  # Point estimates
+                      "|\n", se_linestart(bonus_stats, i), errors[r],  # Now standard errors
+                      "|\n"]
+        return "".join(parts)
     elif not (conf_ints is None):  # Print confidence intervals on alternate rows
         if tdf is not False and sedf is not None:
             try:  # Passed in dataframe?
                 tdf.shape
             except AttributeError:
                 tdf = df[sedf.columns] / sedf
-        lastidx = [""] * levels
-        for i in df.index:
-            if levels == 1:  # Normal index
-                s += "| %s  " % i
-            else:
-                for k in range(levels):
-                    if lastidx[k] != i[k]:
-                        s += "| %s " % i[k]
-                    else:
-                        s += "| "
-            lastidx = i
-
-            for j in df.columns:  # Point estimates
-                if tdf is not False and tdf is not None:
-                    try:
-                        stars = (np.abs(tdf[j][i]) > 1.65) + 0.0
-                        stars += (np.abs(tdf[j][i]) > 1.96) + 0.0
-                        stars += (np.abs(tdf[j][i]) > 2.577) + 0.0
-                        stars = int(stars)
-                        if stars > 0:
-                            stars = "^{" + "*" * stars + "}"
-                        else:
-                            stars = ""
-                    except KeyError:
-                        stars = ""
-                else:
-                    stars = ""
-                s += format_entry(df[j][i], stars)
-            s += "|\n" + se_linestart(bonus_stats, i)
-
-            for j in df.columns:  # Now confidence intervals
-                s += "  "
-                try:
-                    lower = conf_ints[0][j][i]
-                    upper = conf_ints[1][j][i]
-                    if is_missing(lower) or is_missing(upper):
-                        ci = "---"
-                    else:
-                        ci = "[" + float_fmt + "," + float_fmt + "]"
-                        ci = ci % (lower, upper)
-                except KeyError:
-                    ci = ""
-                entry = "| " + ci + "  "
-                s += entry
-            s += "|\n"
-        return s
+        if tdf is not False and tdf is not None:
+            estimates = format_estimates(significance_stars(tdf))
+        else:
+            estimates = format_estimates()
+
+        lower_columns, lower_found = _align_to(conf_ints[0], df)
+        upper_columns, upper_found = _align_to(conf_ints[1], df)
+        ci_fmt = "[" + float_fmt + "," + float_fmt + "]"
+        cells = []
+        for c in range(df.shape[1]):
+            lower_missing = pd.isna(lower_columns[c])
+            upper_missing = pd.isna(upper_columns[c])
+            cells.append([
+                "" if not (has_lower and has_upper)
+                else "---" if miss_lower or miss_upper
+                else ci_fmt % (lower, upper)
+                for lower, upper, has_lower, has_upper, miss_lower, miss_upper
+                in zip(lower_columns[c], upper_columns[c], lower_found[:, c], upper_found[:, c],
+                       lower_missing, upper_missing)])
+        intervals = ["".join("  | " + ci + "  " for ci in row) for row in zip(*cells)] if cells else [""] * len(df)
+
+        for r, i in enumerate(df.index):
+            parts += [prefixes[r], estimates[r],  # Point estimates
+                      "|\n", se_linestart(bonus_stats, i), intervals[r],  # Now confidence intervals
+                      "|\n"]
+        return "".join(parts)
 
 
 
@@ -381,39 +430,94 @@ def orgtbl_to_df(table, col_name_size=1, format_string=None, index=None, dtype=N
         df.set_index(index, inplace=True)
 
     return df
+_ASCII_SAMPLE = "".join(map(chr, range(128)))
+
+
+@lru_cache(maxsize=None)
+def _ascii_compatible(encoding):
+    """True if *encoding* encodes ASCII text as the same bytes."""
+    try:
+        return _ASCII_SAMPLE.encode(encoding) == _ASCII_SAMPLE.encode("ascii")
+    except (LookupError, UnicodeError):
+        return False
+
+
 def _coerce_label(value, encoding):
     """Return `value` recoded to UTF-8 using the supplied encoding."""
     if encoding is None or value is None:
         return value
     if isinstance(value, bytes):
         return value.decode(encoding, errors="ignore")
-    return str(value).encode(encoding, errors="ignore").decode("utf-8", errors="ignore")
+    value = str(value)
+    if value.isascii() and _ascii_compatible(encoding):  # Recoding would change nothing
+        return value
+    return value.encode(encoding, errors="ignore").decode("utf-8", errors="ignore")
+
+
+def _categorical_from_codes(codes, code_to_label):
+    """Return *codes* (a Series) as a Categorical labelled by *code_to_label*."""
+    labels = list(dict.fromkeys(code_to_label.values()))
+    position = {label: i for i, label in enumerate(labels)}
+    label_codes = pd.Index(list(code_to_label))
+    lookup = np.array([position[code_to_label[c]] for c in label_codes] + [-1])
+
+    found = label_codes.get_indexer(codes)
+    if ((found == -1) & codes.notna().to_numpy()).any():
+        # Values without labels are kept as categories of their own.
+        return codes.replace(code_to_label).astype("category")
+
+    return pd.Series(pd.Categorical.from_codes(lookup[found], categories=labels),
+                     index=codes.index, name=codes.name)
+
+
+def _labels_from_codes(codes, code_to_label):
+    """Return *codes* (a Series) with labelled values replaced by their labels.
+
+    Like ``codes.replace(code_to_label)``, but looks the codes up in one
+    vectorized pass.
+    """
+    found = pd.Index(list(code_to_label)).get_indexer(codes)
+    matched = found >= 0
+    if not matched.any():
+        return codes
+
+    labels = np.array(list(code_to_label.values()), dtype=object)
+    out = np.where(matched, labels[found], codes.to_numpy(dtype=object))
+    return pd.Series(out, index=codes.index, name=codes.name, dtype=object)
 
 
-def from_dta(fn, convert_categoricals=True, encoding=None, categories_only=False):
+def from_dta(fn, convert_categoricals=True, encoding=None, categories_only=False, columns=None):
     """Read a Stata .dta file into a pandas DataFrame.
 
     Parameters
     ----------
     fn : str | pathlib.Path | file-like
         Location of the Stata file or an open binary handle.
-    convert_categoricals : bool, optional
+    convert_categoricals : bool or "category", optional
         When true (default) map labelled columns to their string labels.
+        With ``"category"``, labelled columns become pandas Categoricals
+        built from the integer codes, so each label is stored once rather
+        than once per row.
     encoding : str, optional
         Original character encoding for categorical labels, used to coerce
         values to UTF-8 when provided.
     categories_only : bool, optional
         When true, return the mapping of categorical metadata without
         materializing the DataFrame.
+    columns : list of str, optional
+        Read only these variables.
     """
 
     with pd.io.stata.StataReader(fn) as reader:
         try:
-            df = reader.read(convert_dates=True, convert_categoricals=False)
+            if categories_only:  # Labels are kept apart from the data; skip reading it
+                df = None
+            else:
+                df = reader.read(convert_dates=True, convert_categoricals=False, columns=columns)
+            values = reader.value_labels()
         except struct.error as exc:
             raise ValueError("Not a Stata file?") from exc
 
-        values = reader.value_labels()
         try:
             var_names = reader.varlist
             label_names = reader.lbllist
@@ -424,8 +528,13 @@ def from_dta(fn, convert_categoricals=True, encoding=None, categories_only=False
     var_to_label = dict(zip(var_names, label_names))
     cats = {}
 
+    if df is not None:
+        variables = df.columns
+    else:
+        variables = var_names if columns is None else [var for var in columns if var in var_to_label]
+
     if convert_categoricals:
-        for var in var_names:
+        for var in variables:
             label_key = var_to_label.get(var)
             if not label_key:
                 continue
@@ -438,7 +547,9 @@ def from_dta(fn, convert_categoricals=True, encoding=None, categories_only=False
                 code_to_label = {
                     code: _coerce_label(label, encoding) for code, label in code_to_label.items()
                 }
-            df[var] = df[var].replace(code_to_label)
+            if df is not None:
+                decode = _categorical_from_codes if convert_categoricals == "category" else _labels_from_codes
+                df[var] = decode(df[var], code_to_label)
             cats[var] = code_to_label
 
     if categories_only:
@@ -447,7 +558,26 @@ def from_dta(fn, convert_categoricals=True, encoding=None, categories_only=False
     return df
 
 
-def _looks_like_pgp(header: bytes, path_hint=None) -> bool:
+def _magic_describer(header: bytes):
+    """Return ``describe(mime=False)`` giving libmagic's view of *header*.
+
+    Each of the MIME type and the description is looked up at most once,
+    so callers sharing a describer don't rescan the same bytes.
+    """
+    results = {}
+
+    def describe(mime=False):
+        if mime not in results:
+            try:
+                results[mime] = magic.from_buffer(header, mime=mime) if magic is not None else None
+            except Exception:
+                results[mime] = None
+        return results[mime]
+
+    return describe
+
+
+def _looks_like_pgp(header: bytes, path_hint=None, describe=None) -> bool:
     """Heuristically determine if the content looks like PGP-encrypted data."""
     if path_hint:
         suffix = str(path_hint).lower()
@@ -458,32 +588,36 @@ def _looks_like_pgp(header: bytes, path_hint=None) -> bool:
     if stripped.startswith(b"-----BEGIN PGP MESSAGE-----"):
         return True
 
-    if magic is not None:
-        try:
-            mime = magic.from_buffer(header, mime=True)
-        except Exception:
-            mime = None
-        try:
-            desc = magic.from_buffer(header)
-        except Exception:
-            desc = None
+    # Heuristic for binary packets: look for "PGP" marker in the first bytes.
+    if b"PGP" in header[:32]:
+        return True
 
-        for candidate in (mime, desc):
-            if candidate and "pgp" in str(candidate).lower():
-                return True
+    if describe is None:
+        describe = _magic_describer(header)
+    for mime in (True, False):  # Description only if the MIME type says nothing
+        candidate = describe(mime=mime)
+        if candidate and "pgp" in str(candidate).lower():
+            return True
 
-    # Fallback heuristic for binary packets: look for "PGP" marker in the first bytes.
-    return b"PGP" in header[:32]
+    return False
 
 
 def _decrypt_with_gpg(stream, path_hint=None):
     """Attempt to decrypt the supplied stream/path with gpg, returning (BytesIO, stderr) on success/failure."""
     use_path = isinstance(stream, (str, Path))
-    payload = None if use_path else stream.read()
+    try:  # gpg can read a file's descriptor itself, without a copy of the ciphertext here
+        use_fd = not use_path and stream.fileno() >= 0
+    except (AttributeError, OSError, ValueError):
+        use_fd = False
+    payload = None if use_path or use_fd else stream.read()
 
     def attempt(cmd, timeout):
         if use_path:
             return subprocess.run(cmd + [str(stream)], capture_output=True, check=False, timeout=timeout)
+        if use_fd:  # A buffered seek may not move the descriptor that gpg reads
+            stream.seek(0)
+            os.lseek(stream.fileno(), 0, os.SEEK_SET)
+            return subprocess.run(cmd, stdin=stream, capture_output=True, check=False, timeout=timeout)
         return subprocess.run(cmd, input=payload, capture_output=True, check=False, timeout=timeout)
 
     cmds = [
@@ -638,7 +772,42 @@ def df_from_orgfile(fn, name=None, set_columns=True, to_numeric=True, encoding=N
     return df
 
 
-def _format_hints(header: bytes, path_hint=None):
+# Leading bytes that identify a format unambiguously.  Zip containers
+# (xlsx, ods, zipped csv) and text formats are left to `_format_hints`.
+_MAGIC_SIGNATURES = (
+    (b"PAR1", "parquet"),
+    (b"ARROW1", "feather"),
+    (b"FEA1", "feather"),
+    (b"$FL2", "spss"),
+    (b"$FL3", "spss"),
+    (b"<stata_dta>", "dta"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "excel"),  # OLE2 (.xls)
+)
+
+# The signatures above by their (distinct) first four bytes, for one lookup.
+_MAGIC_BY_PREFIX = {signature[:4]: (signature, fmt) for signature, fmt in _MAGIC_SIGNATURES}
+
+# Gzip-compressed input is decompressed and its contents sniffed in turn.
+_GZIP_MAGIC = b"\x1f\x8b"
+
+# Release numbers of pre-117 Stata files, stored in their first byte.
+_STATA_RELEASES = frozenset({102, 103, 104, 105, 108, 110, 111, 113, 114, 115})
+
+
+def _sniff_format(header: bytes):
+    """Return the format identified by the magic bytes in *header*, or None."""
+    signature, fmt = _MAGIC_BY_PREFIX.get(header[:4], (None, None))
+    if signature is not None and header.startswith(signature):
+        return fmt
+
+    # Old-style dta: release, byte order (1 or 2), filetype (always 1), padding.
+    if len(header) >= 4 and header[0] in _STATA_RELEASES and header[1] in (1, 2) and header[2:4] == b"\x01\x00":
+        return "dta"
+
+    return None
+
+
+def _format_hints(header: bytes, path_hint=None, describe=None):
     """Return ordered format hints like ['csv', 'excel', ...] based on magic and suffix."""
     hints = []
 
@@ -646,16 +815,13 @@ def _format_hints(header: bytes, path_hint=None):
         if hint and hint not in hints:
             hints.append(hint)
 
-    mime = desc = None
-    if magic is not None:
-        try:
-            mime = magic.from_buffer(header, mime=True)
-        except Exception:
-            mime = None
-        try:
-            desc = magic.from_buffer(header)
-        except Exception:
-            desc = None
+    if header.startswith(b"PK\x03\x04"):  # Zip container; most likely a workbook
+        add("excel")
+
+    if describe is None:
+        describe = _magic_describer(header)
+    mime = describe(mime=True)
+    desc = describe()
 
     def match(val):
         if not val:
@@ -689,6 +855,7 @@ def _format_hints(header: bytes, path_hint=None):
             ".parquet": "parquet",
             ".feather": "feather",
             ".sav": "spss",
+            ".zsav": "spss",
             ".dta": "dta",
             ".fwf": "fwf",
             ".org": "org",
@@ -698,18 +865,305 @@ def _format_hints(header: bytes, path_hint=None):
     return hints
 
 
-@lru_cache(maxsize=3)
-def get_dataframe(fn,convert_categoricals=True,encoding=None,categories_only=False,sheet=None):
+# Frames read from files on disk, most recently used last.  Entries are
+# keyed on the path, its mtime and size, and the reader arguments.
+_FRAME_CACHE = OrderedDict()
+_FRAME_CACHE_MAXSIZE = 32
+_FRAME_CACHE_MAX_BYTES = 2**30
+
+# The reader that last succeeded for each path whose format had to be
+# found by trial, tried first when the file is read again.
+_READER_HINTS = {}
+
+# Open workbooks, keyed like _FRAME_CACHE on path, mtime and size, so that
+# reading several sheets of one file parses its container (the zip
+# directory, shared strings and styles) only once.
+_WORKBOOKS = OrderedDict()
+_WORKBOOKS_MAXSIZE = 4
+
+# Guards the caches above when files are read from several threads.
+_CACHE_LOCK = threading.RLock()
+
+
+def _frame_nbytes(obj):
+    """Approximate memory held by a DataFrame (or dict of them).
+
+    Object columns count only their pointers; sizing every string would
+    cost about as much as reading the file.
+    """
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=False).sum())
+    if isinstance(obj, dict):
+        return sum(_frame_nbytes(v) for v in obj.values())
+    return 0
+
+
+def _workbook(path):
+    """Return an open :class:`pandas.ExcelFile` for *path*, reusing one already open."""
+    st = os.stat(path)
+    key = (path, st.st_mtime_ns, st.st_size)
+    with _CACHE_LOCK:
+        try:
+            _WORKBOOKS.move_to_end(key)
+            return _WORKBOOKS[key]
+        except KeyError:
+            pass
+        workbook = _WORKBOOKS[key] = pd.ExcelFile(path, engine=_EXCEL_ENGINE)
+        while len(_WORKBOOKS) > _WORKBOOKS_MAXSIZE:
+            _WORKBOOKS.popitem(last=False)[1].close()
+        return workbook
+
+
+def _read_excel(stream, sheet_name=None, usecols=None, dtype=None):
+    """Read a workbook, with the Rust calamine engine when it is installed."""
+    if isinstance(stream, pd.ExcelFile):  # Already open, engine and all
+        return pd.read_excel(stream, sheet_name=sheet_name, usecols=usecols, dtype=dtype)
+    return pd.read_excel(stream, sheet_name=sheet_name, usecols=usecols, dtype=dtype, engine=_EXCEL_ENGINE)
+
+
+def _read_csv_arrow(stream, encoding=None, usecols=None, dtype=None):
+    """Read a csv file into Arrow-backed columns with pyarrow's multithreaded parser.
+
+    pyarrow is stricter than the C parser (it rejects short rows, for
+    instance), so files it can't parse are read again by the C parser.
+    """
+    try:
+        return pd.read_csv(stream, encoding=encoding, engine="pyarrow", dtype_backend="pyarrow", usecols=usecols,
+                           dtype=dtype)
+    except (ImportError, ValueError):
+        if not hasattr(stream, "seek"):
+            raise
+        stream.seek(0)
+    return pd.read_csv(stream, encoding=encoding, dtype_backend="pyarrow", usecols=usecols, dtype=dtype)
+
+
+# SPSS files at least this large are parsed by several processes at once.
+_SPSS_PARALLEL_BYTES = 64 * 2**20
+
+
+def _read_spss(stream, path=None, convert_categoricals=True, usecols=None):
+    """Read an SPSS file, in parallel chunks when *path* is large.
+
+    pyreadstat needs a filename, so *stream* is only read directly when
+    there is no local *path*; large files are split across processes.
+    """
+    try:
+        size = os.path.getsize(path) if path is not None else None
+    except (OSError, TypeError):
+        size = None
+    large = size is not None and size >= _SPSS_PARALLEL_BYTES
+
+    if large and (os.cpu_count() or 1) > 1:
+        try:
+            import pyreadstat
+        except ImportError:  # pragma: no cover - optional dependency
+            pass
+        else:
+            df, meta = pyreadstat.read_file_multiprocessing(
+                pyreadstat.read_sav, os.fspath(path),
+                num_processes=os.cpu_count(),
+                apply_value_formats=bool(convert_categoricals),
+                formats_as_category=True,
+                usecols=usecols)
+            df.attrs = meta.__dict__
+            return df
+
+    return pd.read_spss(stream if size is None else path,
+                        convert_categoricals=convert_categoricals, usecols=usecols)
+
+
+def _needs_buffering(stream):
+    """True if *stream* should be read into memory before probing readers.
+
+    Non-seekable streams must be; so should remote (e.g. fsspec) file
+    objects, where each ``seek(0)`` between reader attempts may re-fetch
+    the data.  Only streams backed by a local descriptor, or already in
+    memory, are probed in place.
+    """
+    if not hasattr(stream, "seek") or (hasattr(stream, "seekable") and not stream.seekable()):
+        return True
+    if isinstance(stream, BytesIO):
+        return False
+    try:
+        stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        return True
+    return False
+
+
+def _buffer_stream(stream, chunk_size=1 << 16):
+    """Copy *stream* into a seekable in-memory buffer.
+
+    A non-seekable stream (a pipe, an HTTP response) is copied a chunk at
+    a time: ``BytesIO(stream.read())`` would briefly hold the data twice,
+    as ``read()`` accumulates it and then joins it.  Seekable remote files
+    know their size, and one ``read()`` is one request for the lot.
+    """
+    if hasattr(stream, "seekable") and stream.seekable():
+        return BytesIO(stream.read())
+    buffer = BytesIO()
+    shutil.copyfileobj(stream, buffer, chunk_size)
+    buffer.seek(0)
+    return buffer
+
+
+# pandas 3 always copies on write; earlier releases only when asked to.
+_ALWAYS_COPY_ON_WRITE = int(pd.__version__.split(".")[0]) >= 3
+
+
+def _copy_result(obj):
+    """Copy a cached result so callers' changes don't reach the cache.
+
+    Under copy-on-write a shallow copy is enough; otherwise in-place edits
+    (``df.loc[0, "x"] = ...``) would write through shared blocks, so the
+    data are copied too.
+    """
+    if isinstance(obj, dict):
+        return {k: _copy_result(v) for k, v in obj.items()}
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        return obj.copy(deep=not (_ALWAYS_COPY_ON_WRITE or pd.options.mode.copy_on_write is True))
+    return obj
+
+
+def _cache_token(value):
+    """Return a hashable stand-in for a reader argument.
+
+    Iterables (lists, arrays, ``pd.Index``) become tuples, and dict keys
+    are told apart by type, so ``{1: ...}`` and ``{"1": ...}`` differ.
+    """
+    if isinstance(value, dict):
+        items = (((type(k).__name__, repr(k)), _cache_token(v)) for k, v in value.items())
+        return tuple(sorted(items, key=lambda item: item[0]))
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_cache_token(v) for v in value)
+    if isinstance(value, Iterable) and not isinstance(value, (str, bytes)):
+        return tuple(_cache_token(v) for v in value)
+    return value
+
+
+def get_dataframe(fn,convert_categoricals=True,encoding=None,categories_only=False,sheet=None,prefer="pandas",
+                  columns=None,filters=None,dtype=None):
     """From a file named fn, try to return a dataframe.
 
     Hope is that caller can be agnostic about file type.
+
+    ``convert_categoricals="category"`` decodes labelled Stata columns
+    into pandas Categoricals instead of object columns of labels (SPSS
+    labels are already returned as categories).
+
+    With ``prefer="arrow"``, parquet, feather and csv files are read by
+    pyarrow into Arrow-backed columns, which is much faster for large
+    files (csv files pyarrow can't parse are left to the pandas parser);
+    the default ``"pandas"`` uses the pandas-native readers.
+
+    For workbooks, ``sheet`` names (or numbers) the sheet to read; a list
+    of sheets gives a dict of dataframes from one pass over the workbook,
+    and ``None`` gives every sheet.
+
+    ``columns`` restricts the read to the named columns, which most
+    readers (and parquet in particular) can do without parsing the rest.
+    ``filters`` are pyarrow row filters such as ``[("year", ">=", 2010)]``;
+    they only apply to parquet files, and other files raise ValueError.
+
+    ``dtype`` gives the types of columns (a type, or a dict by column) for
+    the text and workbook readers (csv, fixed-width and Excel), which then
+    skip inferring them; files that store their types ignore it.
+
+    Results for files on disk are cached on the path, the file's
+    modification time and size, and the remaining arguments, so an edited
+    file is read afresh; results for ``BytesIO`` buffers are cached on a
+    hash of their contents.  Callers get a copy of a cached result.
+    The cache holds up to 32 results within about 1 GiB;
+    ``get_dataframe.cache_clear()`` empties it.  The reader that worked for
+    a path is tried first when the file is read again.
     """
+    if prefer not in ("pandas", "arrow"):
+        raise ValueError(f"prefer must be 'pandas' or 'arrow', not {prefer!r}.")
+
+    options = dict(convert_categoricals=convert_categoricals, encoding=encoding,
+                   categories_only=categories_only, sheet=sheet, prefer=prefer,
+                   columns=columns, filters=filters, dtype=dtype)
+
+    try:
+        token = _cache_token(options)
+        hash(token)
+    except TypeError:  # An argument that can't be part of a key; read without the cache
+        return _get_dataframe(fn, **options)
+
+    if isinstance(fn, BytesIO):  # Equal contents are the same file, whatever the buffer
+        with fn.getbuffer() as view:
+            digest = hashlib.blake2b(view, digest_size=16).digest()
+        key = (digest, token)
+    elif isinstance(fn, (str, os.PathLike)):
+        try:
+            st = os.stat(fn)
+        except OSError:
+            return _get_dataframe(fn, **options)
+        key = (os.path.abspath(fn), st.st_mtime_ns, st.st_size, token)
+    else:
+        return _get_dataframe(fn, **options)
+
+    with _CACHE_LOCK:
+        try:
+            _FRAME_CACHE.move_to_end(key)
+            return _copy_result(_FRAME_CACHE[key][0])
+        except KeyError:
+            pass
+
+    df = _get_dataframe(fn, **options)
+
+    nbytes = _frame_nbytes(df)
+    if nbytes <= _FRAME_CACHE_MAX_BYTES:
+        with _CACHE_LOCK:
+            _FRAME_CACHE[key] = (df, nbytes)
+            while (len(_FRAME_CACHE) > _FRAME_CACHE_MAXSIZE
+                   or sum(n for _, n in _FRAME_CACHE.values()) > _FRAME_CACHE_MAX_BYTES):
+                _FRAME_CACHE.popitem(last=False)
+
+    return _copy_result(df)
 
-    def read_file(f,convert_categoricals=convert_categoricals,encoding=encoding,sheet=sheet,path_hint=None):
+
+def _cache_clear():
+    with _CACHE_LOCK:
+        _FRAME_CACHE.clear()
+        _READER_HINTS.clear()
+        while _WORKBOOKS:
+            _WORKBOOKS.popitem()[1].close()
+
+
+get_dataframe.cache_clear = _cache_clear
+
+
+def get_dataframes(paths, sheet=None, max_workers=None, **kwargs):
+    """Read several files with :func:`get_dataframe`, concurrently.
+
+    Returns a dict mapping each of ``paths`` (as a :class:`~pathlib.Path`)
+    to its dataframe.  ``sheet`` and any other keyword arguments are
+    passed to :func:`get_dataframe` for every file, and results share its
+    cache.  The files are read on a pool of up to ``max_workers`` threads
+    (default 8); the parquet, feather and csv parsers release the GIL, so
+    a batch of such files reads in roughly the time of the largest.  The
+    first error raised by any read is raised here.
+    """
+    paths = list(dict.fromkeys(Path(p) for p in paths))
+    if not paths:
+        return {}
+    if max_workers is None:
+        max_workers = min(8, len(paths))
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        frames = pool.map(lambda p: get_dataframe(p, sheet=sheet, **kwargs), paths)
+        return dict(zip(paths, frames))
+
+
+def _get_dataframe(fn,convert_categoricals,encoding,categories_only,sheet,prefer,columns,filters,dtype):
+    """Read *fn* into a dataframe without consulting the cache."""
+    cache_path = os.path.abspath(fn) if isinstance(fn, (str, os.PathLike)) else None
+
+    def read_file(f,path_hint=None):
         stream = f
         if not isinstance(stream, (str, Path)):
-            if (not hasattr(stream, "seek")) or (hasattr(stream, "seekable") and not stream.seekable()):
-                stream = BytesIO(stream.read())
+            if _needs_buffering(stream):
+                stream = _buffer_stream(stream)
             else:
                 stream.seek(0)
 
@@ -721,7 +1175,10 @@ def get_dataframe(fn,convert_categoricals=True,encoding=None,categories_only=Fal
                 if name:
                     path_hint = name
 
+        readable = True
+
         def peek_header():
+            nonlocal readable
             try:
                 if isinstance(stream, (str, Path)):
                     with open(stream, "rb") as handle:
@@ -739,94 +1196,321 @@ def get_dataframe(fn,convert_categoricals=True,encoding=None,categories_only=Fal
                     stream.seek(0)
                 return data
             except OSError:
+                readable = False
                 return b""
 
         header = peek_header()
+        if not header and readable:  # An empty file holds an empty dataframe
+            return pd.DataFrame()
+        fmt = _sniff_format(header)
         pgp_detected = False
-        if header and _looks_like_pgp(header, path_hint=path_hint):
+        describe = _magic_describer(header)
+        if fmt is None and header and _looks_like_pgp(header, path_hint=path_hint, describe=describe):
             pgp_detected = True
             decrypted, err = _decrypt_with_gpg(stream, path_hint=path_hint)
             if decrypted is not None:
                 stream = decrypted
+                header = peek_header()
+                fmt = _sniff_format(header)
+                describe = _magic_describer(header)
             elif not isinstance(stream, (str, Path)) and hasattr(stream, "seek"):
                 try:
                     stream.seek(0)
                 except Exception:
                     pass
 
-        format_hints = _format_hints(header or b"", path_hint=path_hint)
+        gunzipped = False
+        if header.startswith(_GZIP_MAGIC) and not isinstance(stream, (str, Path)):
+            gunzipped = True
+            stream.seek(0)
+            with gzip.GzipFile(fileobj=stream) as compressed:
+                stream = _buffer_stream(compressed)
+            header = peek_header()
+            fmt = _sniff_format(header)
+            describe = _magic_describer(header)
 
         def reset():
             if hasattr(stream, "seek"):
                 stream.seek(0)
 
+        def read_org():
+            df = df_from_orgfile(stream if isinstance(stream, (str, Path)) else path_hint,
+                                 encoding=encoding)
+            return df if columns is None else df[columns]
+
         readers = {
-            "spss": lambda: pd.read_spss(stream,convert_categoricals=convert_categoricals),
-            "parquet": lambda: pd.read_parquet(stream, engine='pyarrow'),
-            "dta": lambda: from_dta(stream,convert_categoricals=convert_categoricals,encoding=encoding,categories_only=categories_only),
-            "csv": lambda: pd.read_csv(stream,encoding=encoding),
-            "excel": lambda: pd.read_excel(stream,sheet_name=sheet),
-            "feather": lambda: pd.read_feather(stream),
-            "fwf": lambda: pd.read_fwf(stream),
-            "org": lambda: df_from_orgfile(stream if isinstance(stream, (str, Path)) else path_hint,
-                                           encoding=encoding),
+            "spss": lambda: _read_spss(stream, path=None if pgp_detected or gunzipped else path_hint,
+                                       convert_categoricals=convert_categoricals, usecols=columns),
+            "parquet": lambda: pd.read_parquet(stream, engine='pyarrow', columns=columns, filters=filters),
+            "dta": lambda: from_dta(stream,convert_categoricals=convert_categoricals,encoding=encoding,
+                                    categories_only=categories_only,columns=columns),
+            "csv": lambda: pd.read_csv(stream,encoding=encoding,usecols=columns,dtype=dtype),
+            "excel": lambda: _read_excel(stream if cache_path is None or pgp_detected or gunzipped
+                                         else _workbook(cache_path),
+                                         sheet_name=sheet, usecols=columns, dtype=dtype),
+            "feather": lambda: pd.read_feather(stream, columns=columns),
+            "fwf": lambda: pd.read_fwf(stream, usecols=columns, dtype=dtype),
+            "org": read_org,
         }
+        if prefer == "arrow":
+            readers.update({
+                "parquet": lambda: pd.read_parquet(stream, engine="pyarrow", dtype_backend="pyarrow",
+                                                   columns=columns, filters=filters),
+                "feather": lambda: pd.read_feather(stream, dtype_backend="pyarrow", columns=columns),
+                "csv": lambda: _read_csv_arrow(stream, encoding=encoding, usecols=columns, dtype=dtype),
+            })
+        # Only parquet can apply row filters, and parquet files always carry
+        # their magic bytes, so anything not sniffed as parquet is refused.
+        if filters is not None and fmt != "parquet":
+            raise ValueError(f"filters are only supported for parquet files, not {fmt or path_hint or fn}.")
+
+        if fmt is not None:  # Magic bytes settle it; don't probe other readers
+            try:
+                reset()
+                return readers[fmt]()
+            except Exception as exc:
+                raise ValueError(f"Unable to read {path_hint or fn} as {fmt}.") from exc
+
+        if gunzipped and path_hint and str(path_hint).lower().endswith(".gz"):
+            path_hint = str(path_hint)[:-3]  # data.csv.gz holds data.csv
+        format_hints = _format_hints(header or b"", path_hint=path_hint, describe=describe)
 
-        order = []
+        order = [_READER_HINTS[cache_path]] if cache_path in _READER_HINTS else []
         for hint in format_hints:
             if hint in readers and hint not in order:
                 order.append(hint)
-        for fallback in ["spss","parquet","dta","csv","excel","feather","fwf","org"]:
-            if fallback not in order:
+        # SPSS is only tried when hinted: pyreadstat can spend seconds
+        # failing to parse a large non-SPSS file.  Formats with a signature
+        # of their own were already ruled out by `_sniff_format`, as were
+        # workbooks unless the header is a zip container.
+        ruled_out = set()
+        if header:
+            ruled_out = {"parquet", "dta", "feather"}
+            if not header.startswith(b"PK\x03\x04"):
+                ruled_out.add("excel")
+        for fallback in ["parquet","dta","csv","excel","feather","fwf","org"]:
+            if fallback not in order and fallback not in ruled_out:
                 order.append(fallback)
 
         for name in order:
+            if name not in readers:
+                continue
             try:
                 reset()
-                return readers[name]()
+                df = readers[name]()
             except Exception:
                 continue
+            if cache_path is not None:
+                _READER_HINTS[cache_path] = name
+            return df
 
         if pgp_detected:
             raise ValueError(f"Failed to decrypt PGP file {path_hint}: {err}")
         raise ValueError(f"Unknown file type for {fn}.")
 
-    try:
-        with open(fn,mode='rb') as f:
-            df = read_file(f,convert_categoricals=convert_categoricals,encoding=encoding,path_hint=fn)
-    except (TypeError,ValueError): # Needs filename?
-        df = read_file(fn,convert_categoricals=convert_categoricals,encoding=encoding,path_hint=fn)
+    if isinstance(fn, (str, os.PathLike)):
+        if os.path.isfile(fn):
+            with open(fn,mode='rb') as f:
+                return read_file(f,path_hint=fn)
+        if not os.path.exists(fn):
+            raise FileNotFoundError(f"No such file: {fn}")
+        if os.path.isdir(fn):
+            raise IsADirectoryError(f"Is a directory: {fn}")
+
+    return read_file(fn)
+
+# Python's ``\s`` restricted to ASCII, spelled out for RE2.
+_ASCII_WHITESPACE = r"[\t\n\x0b\x0c\r\x1c-\x1f ]+"
+
+
+def _normalized_ascii(values, case="lower"):
+    """`strings.normalized` of many ASCII strings at once, with pyarrow."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    arr = pa.array(values, type=pa.string())
+    if case == "lower":
+        arr = pc.ascii_lower(arr)
+    elif case == "upper":
+        arr = pc.ascii_upper(arr)
+    arr = pc.replace_substring(arr, "-", " ")
+    arr = pc.replace_substring_regex(arr, _ASCII_WHITESPACE, " ")
+    arr = pc.utf8_trim(arr, " ")
+    return arr.to_pylist()
+
+
+def _is_string_like(dtype):
+    """True for dtypes that may hold strings: object, string, categorical
+    and Arrow string columns."""
+    if pd.api.types.is_object_dtype(dtype) or isinstance(dtype, (pd.StringDtype, pd.CategoricalDtype)):
+        return True
+    if isinstance(dtype, pd.ArrowDtype):
+        import pyarrow as pa
+
+        return pa.types.is_string(dtype.pyarrow_dtype) or pa.types.is_large_string(dtype.pyarrow_dtype)
+    return False
 
-    return df
 
 def normalize_strings(df,**kwargs):
     """Normalize strings in a dataframe.
+
+    Only string-like (object, string, categorical and Arrow string) columns
+    are visited; numeric columns are never walked.  Within each, the
+    distinct strings are normalized once and broadcast back with a single
+    `Series.map`; other values are returned as-is.  ASCII values are
+    normalized together by pyarrow's compute kernels when it is installed.
     """
     from . import strings
 
+    @lru_cache(maxsize=None)
+    def normalized(s):
+        return strings.normalized(s,**kwargs)
+
+    # Only plain lower/upper-casing has an exact pyarrow equivalent.
+    fast = set(kwargs) <= {"case"} and kwargs.get("case", "lower") != "title"
+    if fast:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:  # pragma: no cover - optional dependency
+            fast = False
+
     def normalize_string(s):
         if isinstance(s, str):
-            return strings.normalized(s,**kwargs)
+            return normalized(s)
         return s  # If it's not a string, return it as-is
 
+    def normalize_values(values):
+        mapping = {}
+        ascii_strings = []
+        for v in values:
+            if isinstance(v, str) and fast and v.isascii():
+                ascii_strings.append(v)
+            else:
+                mapping[v] = normalize_string(v)
+        if ascii_strings:
+            mapping.update(zip(ascii_strings, _normalized_ascii(ascii_strings, **kwargs)))
+        return mapping
+
+    def normalize_column(col):
+        if pd.api.types.is_object_dtype(col.dtype):
+            # Map only the strings: other values may be unhashable, or hash
+            # equal to one another (1, True and 1.0).
+            is_str = np.fromiter((isinstance(v, str) for v in col), dtype=bool, count=len(col))
+            strings = col[is_str]
+            out = col.to_numpy(dtype=object, copy=True)
+            out[is_str] = strings.map(normalize_values(strings.unique())).to_numpy(dtype=object)
+            return pd.Series(out, index=col.index, name=col.name)
+
+        mapping = normalize_values(col.dropna().unique())
+        out = col.map(mapping)
+        if not isinstance(col.dtype, pd.CategoricalDtype):
+            out = out.astype(col.dtype)
+        return out
+
+    if isinstance(df, pd.Series):
+        return normalize_column(df)
+
+    out = df.copy(deep=False)
+    for i, dtype in enumerate(out.dtypes):
+        if _is_string_like(dtype):
+            out.isetitem(i, normalize_column(out.iloc[:, i]))
+
+    return out
+
+def _greedy_assignment(scores):
+    """Pair rows and columns of *scores* greedily, best rows first.
+
+    Each column is used at most once.  Returns ``(rows, cols)`` like
+    :func:`scipy.optimize.linear_sum_assignment`.
+    """
+    rows, cols = [], []
+    used = np.zeros(scores.shape[1], dtype=bool)
+    for i in np.argsort(-scores.max(axis=1), kind="stable"):
+        if used.all():
+            break
+        j = int(np.where(used, -1, scores[i]).argmax())
+        used[j] = True
+        rows.append(int(i))
+        cols.append(j)
+    return rows, cols
 
-    return df.map(normalize_string)
+def _unique_values(values):
+    """Distinct non-missing entries of *values*, in order of appearance."""
+    if not isinstance(values, pd.Series):
+        values = pd.Series(list(values), dtype=object)
+    return values.dropna().unique().tolist()
+
+
+def _full_process(s):
+    """Default preprocessing, as in :func:`thefuzz.process.extractOne`."""
+    from thefuzz import utils
+
+    return utils.full_process(s, force_ascii=True)
+
+
+def _match_strings(s1_list, s2_list, forms, similarity_threshold, verbose, workers=-1, scorer=None):
+    """Score *s1_list* against *s2_list* and match them one-to-one.
+
+    *forms* maps each string to the preprocessed form that is scored;
+    *scorer* defaults to WRatio.
+    """
+    from rapidfuzz import fuzz, process
+
+    scores = process.cdist(
+        [forms[s] for s in s1_list],
+        [forms[s] for s in s2_list],
+        scorer=fuzz.WRatio if scorer is None else scorer,
+        processor=None,
+        score_cutoff=similarity_threshold,
+        workers=workers,
+    )
+
+    # Scores under the cutoff are zero; strings with no candidate at all
+    # needn't enter the (cubic) assignment.
+    candidates = scores >= similarity_threshold
+    keep_rows = np.flatnonzero(candidates.any(axis=1))
+    keep_cols = np.flatnonzero(candidates.any(axis=0))
+    if not len(keep_rows):
+        return {}
+    scores = scores[np.ix_(keep_rows, keep_cols)]
+
+    try:
+        from scipy.optimize import linear_sum_assignment
+    except ImportError:  # pragma: no cover - optional dependency
+        rows, cols = _greedy_assignment(scores)
+    else:
+        rows, cols = linear_sum_assignment(scores, maximize=True)
+
+    result = {}
+    for r, c in zip(rows, cols):
+        score = scores[r, c]
+        i, j = keep_rows[r], keep_cols[c]
+        if score < similarity_threshold:
+            continue
+        result[s1_list[i]] = s2_list[j]
+        if verbose and score < 100:
+            print(f"{s1_list[i]} matched to {s2_list[j]} with score {int(round(score))}")
+
+    return result
 
-import pandas as pd
-from typing import Callable, Dict, Set
 
 def find_similar_pairs(
     s1: pd.Series,
     s2: pd.Series,
     similarity_threshold=85,
-    verbose=False) -> Dict[str, str]:
-    from . import strings
-
+    verbose=False,
+    block: Callable[[str], object] = None,
+    processor: Callable[[str], str] = _full_process,
+    workers: int = -1,
+    similar: Callable[[str, str], object] = None) -> Dict[str, str]:
     """
     Find pairs of similar strings between two pandas Series.
 
-    For each string in s1, find all strings in s2 where the comparison function
-    `similar` returns True. Each s1 string maps to at most one s2 string.
+    All pairs are scored at once with :func:`rapidfuzz.process.cdist` (the
+    same WRatio scorer and preprocessing used by `strings.most_similar`).
+    Matches are then chosen as a maximum-weight one-to-one assignment with
+    :func:`scipy.optimize.linear_sum_assignment`; without scipy they are
+    assigned greedily, best scores first.
 
     Parameters:
     -----------
@@ -835,37 +1519,77 @@ def find_similar_pairs(
     s2 : pd.Series
         Second series of strings to compare
     similarity_threshold : How demanding is match?
+    block : callable, optional
+        Maps a string to a blocking key (e.g. ``lambda s: s[:1].lower()``).
+        When given, only strings sharing a key are compared, which can
+        prune most of the grid on long lists at the cost of never matching
+        across blocks.
+    processor : callable, optional
+        Applied once to every distinct string before scoring; defaults to
+        thefuzz's ``full_process``.  Pass e.g. `strings.normalized` to
+        compare normalized forms, or None to score the raw strings.
+    workers : int, optional
+        Number of threads used for scoring; -1 (default) uses all cores.
+        The scorer releases the GIL, so with `block` the blocks are
+        scored concurrently.
+    similar : callable, optional
+        Pairwise comparison used in place of WRatio, for callers of the
+        older interface, e.g. `strings.similar`.  It is called on the raw
+        strings (``processor`` is ignored); a True result scores 100 and
+        a number is taken as the score.
 
     Returns:
     --------
     Dict[str, str]
         Dictionary mapping strings from s1 to similar strings in s2.
-        Only includes pairs where similar() returned True.
+        Only includes pairs scoring at least similarity_threshold.
         Each s1 string appears at most once in the keys.
         Each s2 string appears at most once in the values.
     """
-    result = {}
-    used_s2 = set()  # Track s2 strings already matched
-
-    # Convert series to sets for faster lookup and to avoid duplicates
-    if isinstance(s1,(list,tuple,set)):
-        s1_strings = set(s1)
+    # Distinct, non-missing strings in order of first appearance
+    s1_list = _unique_values(s1)
+    s2_list = _unique_values(s2)
+    if not s1_list or not s2_list:
+        return {}
+
+    scorer = None
+    if similar is not None:
+        processor = None
+
+        def scorer(a, b, **kwargs):
+            score = similar(a, b)
+            return 100.0 * score if isinstance(score, bool) else float(score)
+
+    if processor is None:
+        forms = {s: s for s in s1_list + s2_list}
     else:
-        s1_strings = set(s1.dropna())
+        forms = {s: processor(s) for s in dict.fromkeys(s1_list + s2_list)}
 
-    if isinstance(s2,(list,tuple,set)):
-        s2_strings = set(s2)
-    else:
-        s2_strings = set(s2.dropna())
+    if block is None:
+        return _match_strings(s1_list, s2_list, forms, similarity_threshold, verbose, workers, scorer)
+
+    blocks = {}
+    for s in s1_list:
+        blocks.setdefault(block(s), ([], []))[0].append(s)
+    for s in s2_list:
+        blocks.setdefault(block(s), ([], []))[1].append(s)
 
-    for str1 in s1_strings:
-        if str1 in result:
-            continue  # Already matched
+    # Strings in different blocks are never paired, so matching each block
+    # separately gives the same assignment as matching the whole grid.
+    pairs = [(left, right) for left, right in blocks.values() if left and right]
 
-        out = strings.most_similar(str1,s2_strings,similarity_threshold=similarity_threshold,verbose=verbose,return_similarity=True)
+    def match(pair):
+        return _match_strings(*pair, forms, similarity_threshold, verbose, workers=1, scorer=scorer)
 
-        if out is not None:
-            name, score = out
-            result[str1] = name
+    nthreads = os.cpu_count() if workers == -1 else workers
+    if nthreads and nthreads > 1 and len(pairs) > 1:
+        with ThreadPoolExecutor(max_workers=nthreads) as pool:
+            matches = list(pool.map(match, pairs))
+    else:
+        matches = map(match, pairs)
+
+    result = {}
+    for matched in matches:
+        result.update(matched)
 
     return result
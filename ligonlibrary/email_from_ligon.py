@@ -1,18 +1,23 @@
 import base64
+import json
 import os
 from email.headerregistry import Address
+from email.message import Message
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.utils import parseaddr
-from html.parser import HTMLParser
 from pathlib import Path
+import re
 import time
 from typing import Iterable, NamedTuple
 
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+from google.oauth2 import service_account
+from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from requests import HTTPError
 
 
 class EmailContent(NamedTuple):
@@ -22,8 +27,12 @@ class EmailContent(NamedTuple):
     html_body: str | None = None
 
 
+_LEADING_TAG = re.compile(r"\s*<")
+
+
 def is_html(s):
-    return bool(s) and s.lstrip().startswith('<')
+    # A match rather than lstrip(), so large bodies are not copied.
+    return bool(s) and _LEADING_TAG.match(s) is not None
 
 
 _VOID_TAGS = {
@@ -44,38 +53,46 @@ _VOID_TAGS = {
 }
 
 
-class _LooseHTMLValidator(HTMLParser):
-    """Lightweight check for obvious mismatched/unclosed tags."""
-
-    def __init__(self):
-        super().__init__()
-        self.stack = []
-        self.errors = []
+# A comment or CDATA section, or a start/end tag; attribute values may contain '>'.
+_TAG_RE = re.compile(
+    r"<!--.*?(?:-->|\Z)"
+    r"|<!\[CDATA\[.*?(?:\]\]>|\Z)"
+    r"""|<(/?)([a-zA-Z][^\t\n\r\f />]*)((?:[^>"']|"[^"]*"|'[^']*')*)>""",
+    re.DOTALL,
+)
 
-    def handle_starttag(self, tag, attrs):
-        if tag not in _VOID_TAGS:
-            self.stack.append(tag)
-
-    def handle_startendtag(self, tag, attrs):
-        # Self-closing; nothing to track
-        return
-
-    def handle_endtag(self, tag):
-        if tag in _VOID_TAGS:
-            return
-        if not self.stack or self.stack[-1] != tag:
-            self.errors.append(f"Unexpected </{tag}>; open stack={self.stack!r}")
-        else:
-            self.stack.pop()
+# Elements whose content is raw text, not markup, and the end tag of each.
+_RAW_TEXT_END = {tag: re.compile(rf"</{tag}", re.IGNORECASE) for tag in ("script", "style")}
 
 
 def _validate_html_body(html_body: str):
-    parser = _LooseHTMLValidator()
-    parser.feed(html_body)
-    if parser.stack:
-        parser.errors.append(f"Unclosed tags: {parser.stack!r}")
-    if parser.errors:
-        raise ValueError("; ".join(parser.errors))
+    """Lightweight check for obvious mismatched/unclosed tags."""
+    stack = []
+    errors = []
+    pos = 0
+    while (m := _TAG_RE.search(html_body, pos)) is not None:
+        pos = m.end()
+        closing, tag, attrs = m.groups()
+        if tag is None:  # Comment or CDATA
+            continue
+        tag = tag.lower()
+        if tag in _VOID_TAGS:
+            continue
+        if closing:
+            if not stack or stack[-1] != tag:
+                errors.append(f"Unexpected </{tag}>; open stack={stack!r}")
+            else:
+                stack.pop()
+        elif not attrs.endswith("/"):  # Self-closing tags need no match
+            stack.append(tag)
+            if tag in _RAW_TEXT_END:
+                end = _RAW_TEXT_END[tag].search(html_body, pos)
+                pos = len(html_body) if end is None else end.start()
+
+    if stack:
+        errors.append(f"Unclosed tags: {stack!r}")
+    if errors:
+        raise ValueError("; ".join(errors))
 
 
 def _format_addresses(addresses: Iterable[str] | str) -> str:
@@ -93,18 +110,43 @@ def _format_addresses(addresses: Iterable[str] | str) -> str:
     return ", ".join(formatted)
 
 
-def _send_with_retry(service, message_body, max_retries: int = 3, base_sleep: float = 0.2):
-    """Send a message with basic backoff on rate limits."""
+# Gmail advises against batches of more than 50 requests.
+_BATCH_SIZE = 50
+
+
+def _send_batched(service, message_bodies, max_retries: int = 3, base_sleep: float = 0.2):
+    """Send many messages in batched HTTP requests, retrying rate limits.
+
+    *message_bodies* maps a request id (a string) to a message body.
+    Returns a dict mapping each id to the API response, or to the
+    exception raised for that message.
+    """
+    results = {}
+    pending = dict(message_bodies)
     for attempt in range(max_retries):
-        try:
-            return service.users().messages().send(userId="me", body=message_body).execute()
-        except HttpError as exc:
-            status = getattr(exc.resp, "status", None)
-            if status == 429 and attempt < max_retries - 1:
-                sleep_for = base_sleep * (2**attempt)
-                time.sleep(sleep_for)
-                continue
-            raise
+        limited = {}
+
+        def callback(request_id, response, exception):
+            if (isinstance(exception, HttpError) and getattr(exception.resp, "status", None) == 429
+                    and attempt < max_retries - 1):
+                limited[request_id] = pending[request_id]
+            else:
+                results[request_id] = response if exception is None else exception
+
+        ids = list(pending)
+        for start in range(0, len(ids), _BATCH_SIZE):
+            batch = service.new_batch_http_request(callback=callback)
+            for request_id in ids[start:start + _BATCH_SIZE]:
+                batch.add(service.users().messages().send(userId="me", body=pending[request_id]),
+                          request_id=request_id)
+            batch.execute()
+
+        if not limited:
+            break
+        time.sleep(base_sleep * (2**attempt))
+        pending = limited
+
+    return results
 
 
 def _coerce_cc(cc):
@@ -121,7 +163,7 @@ def _coerce_cc(cc):
 def _as_email_content(value):
     """Accept legacy (subject, body) tuples or EmailContent with optional cc."""
     if isinstance(value, EmailContent):
-        return value
+        return value._replace(cc=_coerce_cc(value.cc))
     if isinstance(value, tuple):
         if len(value) == 2:
             subject, body = value
@@ -140,31 +182,85 @@ ENV_EMAIL_CREDENTIALS = "LIGONLIBRARY_EMAIL_CREDENTIALS"
 
 def _resolve_credentials_path() -> Path:
     """Locate OAuth client secrets used for sending mail."""
-    candidates = []
-
     env_path = os.environ.get(ENV_EMAIL_CREDENTIALS)
-    if env_path:
-        candidate = Path(env_path).expanduser()
-        if candidate.exists():
-            return candidate
-        candidates.append(candidate)
-
-    home_default = Path.home() / ".ligonlibrary" / "email_secret.json"
-    if home_default.exists():
-        return home_default
-    candidates.append(home_default)
-
-    legacy = Path("./.credentials/email_secret.json")
-    if legacy.exists():
-        return legacy
-    candidates.append(legacy)
+    candidates = (
+        *((Path(env_path).expanduser(),) if env_path else ()),
+        Path.home() / ".ligonlibrary" / "email_secret.json",
+        Path("./.credentials/email_secret.json"),
+    )
+    found = next((c for c in candidates if os.path.isfile(c)), None)
+    if found is not None:
+        return found
 
     raise FileNotFoundError(
         f"No email credentials found. Checked: {', '.join(str(c) for c in candidates)}. "
-        f"Set {ENV_EMAIL_CREDENTIALS} to point at your OAuth client secrets."
+        f"Set {ENV_EMAIL_CREDENTIALS} to point at your OAuth client secrets, or at a "
+        "service account key with domain-wide delegation for the gmail.send scope."
     )
 
 
+def _is_service_account_key(path: Path) -> bool:
+    """True if *path* holds a service account key rather than OAuth client secrets."""
+    try:
+        return json.loads(path.read_text()).get("type") == "service_account"
+    except (OSError, ValueError, AttributeError):
+        return False
+
+
+def _token_path() -> Path:
+    """Where the authorized Gmail token is kept between sessions."""
+    return Path.home() / ".ligonlibrary" / "email_token.json"
+
+
+def _authorize(scopes, subject=None):
+    """Return Gmail credentials, reusing (and refreshing) a saved token.
+
+    If the configured credentials are a service account key, it is used
+    directly, acting as *subject* through domain-wide delegation.
+    Otherwise the browser-based OAuth flow only runs when there is no
+    usable token; its result is saved for the next call.
+    """
+    try:
+        secrets = _resolve_credentials_path()
+    except FileNotFoundError:  # A saved token may still do
+        secrets = None
+    if secrets is not None and _is_service_account_key(secrets):
+        return service_account.Credentials.from_service_account_file(
+            str(secrets), scopes=scopes, subject=subject
+        )
+
+    token_path = _token_path()
+    creds = None
+    if token_path.exists():
+        try:
+            creds = Credentials.from_authorized_user_file(str(token_path), scopes)
+        except ValueError:  # Malformed token; authorize afresh
+            creds = None
+
+    if creds is not None and creds.valid:
+        return creds
+
+    if creds is not None and creds.expired and creds.refresh_token:
+        try:
+            creds.refresh(Request())
+        except RefreshError:  # Revoked or expired refresh token
+            creds = None
+    else:
+        creds = None
+
+    if creds is None:
+        flow = InstalledAppFlow.from_client_secrets_file(secrets or _resolve_credentials_path(), scopes)
+        creds = flow.run_local_server(port=0)
+
+    token_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(token_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.chmod(token_path, 0o600)  # The mode above only applies to new files
+    with os.fdopen(fd, "w") as f:
+        f.write(creds.to_json())
+
+    return creds
+
+
 def _compose_message(to: str, content: EmailContent, from_email: str):
     """Build the MIME message, using multipart/alternative when HTML provided."""
     if content.html_body is not None:
@@ -185,6 +281,25 @@ def _compose_message(to: str, content: EmailContent, from_email: str):
     return message
 
 
+def _encode_message(to: str, content: EmailContent, from_email: str, templates: dict):
+    """Return the formatted To address and base64 raw message for *to*.
+
+    Each distinct *content* is composed and serialized once, and kept in
+    *templates*; recipients after the first only get their own To header
+    spliced onto the cached bytes.
+    """
+    template = templates.get(content)
+    if template is None:
+        message = _compose_message(to, content, from_email)
+        del message["To"]
+        template = templates[content] = message.as_bytes()
+
+    header = Message()
+    header["To"] = _format_addresses((to,))
+    raw = header.as_bytes()[:-1] + template  # Drop the blank line ending the header block
+    return header["To"], base64.urlsafe_b64encode(raw).decode()
+
+
 def email_from_ligon(emails,from_email='ligon@berkeley.edu'):
     """Create and send email from ligon@berkeley.edu.
 
@@ -192,26 +307,43 @@ def email_from_ligon(emails,from_email='ligon@berkeley.edu'):
                   values which are either (subject, body), (subject, body, cc),
                   (subject, body, cc, html_body), or EmailContent(subject, body, cc, html_body).
        - If html_body is provided, send multipart/alternative with both plain and HTML parts.
+       - Messages are sent in batches of up to 50 per HTTP request.  Every
+         message is attempted; if any fail, the error for the first of them
+         is raised afterwards, noting all the recipients that failed.
+       - The OAuth token is saved in ~/.ligonlibrary/email_token.json, so the
+         browser sign-in is only needed when it can't be refreshed.  A service
+         account key with domain-wide delegation may be used instead of client
+         secrets; mail is then sent as from_email without any sign-in.
     """
     SCOPES = [
         "https://www.googleapis.com/auth/gmail.send"
     ]
-    credential_path = _resolve_credentials_path()
-    flow = InstalledAppFlow.from_client_secrets_file(credential_path, SCOPES)
-    creds = flow.run_local_server(port=0)
-
-    try:
-        # create gmail api client
-        service = build("gmail", "v1", credentials=creds)
-
-        for to,body in emails.items():
-            content = _as_email_content(body)
-
-            message = _compose_message(to, content, from_email)
-
-            create_message = {'raw': base64.urlsafe_b64encode(message.as_bytes()).decode()}
+    creds = _authorize(SCOPES, subject=parseaddr(from_email)[1])
+
+    # create gmail api client
+    service = build("gmail", "v1", credentials=creds)
+
+    recipients = {}
+    message_bodies = {}
+    templates = {}
+    for i, (to,body) in enumerate(emails.items()):
+        content = _as_email_content(body)
+
+        recipients[str(i)], raw = _encode_message(to, content, from_email, templates)
+        message_bodies[str(i)] = {'raw': raw}
+
+    results = _send_batched(service, message_bodies)
+    failures = []
+    for request_id, to in recipients.items():
+        msg = results[request_id]
+        if isinstance(msg, Exception):
+            print(F'An error occurred sending to {to}: {msg}')
+            failures.append((to, msg))
+        else:
+            print(f"Sent message to {to} Message Id: {msg['id']}.")
 
-            msg = _send_with_retry(service, create_message)
-            print(f"Sent message to {message['To']} Message Id: {msg['id']}.")
-    except HTTPError as error:
-        print(F'An error occurred: {error}')
+    if failures:
+        _, error = failures[0]
+        error.add_note(f"Sending failed for {len(failures)} of {len(recipients)} messages: "
+                       + ", ".join(to for to, _ in failures))
+        raise error
@@ -2,25 +2,64 @@
 
 from __future__ import annotations
 
+import getpass
 import json
 import os
+import random
+import re
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Dict, Iterable, Mapping, MutableMapping, Optional
-from urllib.error import HTTPError
 
 import gnupg
 import gspread
+import numpy as np
 import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
 from google.oauth2.service_account import Credentials
 from gspread.exceptions import APIError
+from gspread.utils import ValueInputOption, absolute_range_name, fill_gaps, rowcol_to_a1
 from gspread_pandas import Spread
 from gspread_pandas.client import SpreadsheetNotFound
+from gspread_pandas.util import fillna, parse_df_col_names
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover - optional dependency
+    from json import loads as _json_loads
 
 ENV_SERVICE_ACCOUNT_DIR = "LIGONLIBRARY_SERVICE_ACCOUNTS"
 SERVICE_ACCOUNT_EMAIL_FIELD = "client_email"
 
 
+# Statuses worth retrying: rate limits and transient server errors.
+_RETRY_STATUSES = frozenset({429, 500, 502, 503})
+
+
+def _with_backoff(fn, *args, max_retries: int = 5, base: float = 1.0, **kwargs):
+    """Call ``fn(*args, **kwargs)``, retrying rate-limit and server errors.
+
+    Between attempts wait as long as the response's ``Retry-After`` header
+    asks, or else ``base * 2**attempt`` seconds plus jitter.
+    """
+    for attempt in range(max_retries):
+        try:
+            return fn(*args, **kwargs)
+        except APIError as exc:
+            response = getattr(exc, "response", None)
+            if getattr(response, "status_code", None) not in _RETRY_STATUSES or attempt == max_retries - 1:
+                raise
+            try:
+                delay = float(response.headers["Retry-After"])
+            except (AttributeError, KeyError, TypeError, ValueError):
+                delay = base * 2**attempt + random.uniform(0, base)
+            time.sleep(delay)
+
+
 def _default_key_destination() -> Path:
     return Path(
         os.environ.get(
@@ -43,12 +82,36 @@ def decrypt_credentials(
     destination:
         Directory where the decrypted JSON credentials should be stored.
         Each decrypted file is saved under the service account's email.
+
+    The passphrase is read without echo and asked for once per process for
+    each version of *encrypted_key_file*.
     """
     destination_path = Path(destination) if destination is not None else _default_key_destination()
     destination_path.mkdir(parents=True, exist_ok=True)
 
+    mtime = os.stat(encrypted_key_file).st_mtime_ns
+    account_data = _decrypt_cached(os.path.abspath(encrypted_key_file), mtime)
+    credential_path = destination_path / account_data[SERVICE_ACCOUNT_EMAIL_FIELD]
+    try:
+        if credential_path.stat().st_mtime_ns >= mtime:  # Already decrypted
+            return credential_path
+    except OSError:
+        pass
+
+    with credential_path.open("w") as output_file:
+        json.dump(account_data, output_file)
+
+    return credential_path
+
+
+@lru_cache(maxsize=8)
+def _decrypt_cached(encrypted_key_file: str, mtime_ns: int) -> Dict[str, str]:
+    """Decrypt and parse *encrypted_key_file*, asking for its passphrase once per process.
+
+    *mtime_ns* is only part of the cache key, so a replaced file is decrypted afresh.
+    """
     gpg = gnupg.GPG()
-    passphrase = input(
+    passphrase = getpass.getpass(
         f"Input secret passphrase for {encrypted_key_file} to create google drive credentials: "
     )
     with open(encrypted_key_file, "rb") as encrypted_file:
@@ -61,19 +124,13 @@ def decrypt_credentials(
             raise IOError("Unable to write key file.")
         raise RuntimeError(f"Unable to create decrypted file: {status.status}")
 
-    account_data = json.loads(status.data)
-    credential_path = destination_path / account_data[SERVICE_ACCOUNT_EMAIL_FIELD]
-    with credential_path.open("w") as output_file:
-        json.dump(account_data, output_file)
-
-    return credential_path
+    return _json_loads(status.data)
 
 
 def _load_credentials_from_path(
     path: Path, *, verbose: bool = False
 ) -> Dict[str, MutableMapping[str, str]]:
-    with path.open() as credential_file:
-        service_account_info = json.load(credential_file)
+    service_account_info = _json_loads(path.read_bytes())
     if verbose:
         print(f"Key available for {service_account_info[SERVICE_ACCOUNT_EMAIL_FIELD]}.")
     return {
@@ -101,16 +158,14 @@ def get_credentials(
             files: Iterable[Path] = list(path.iterdir())
             if not files:
                 raise IOError
-            for entry in files:
-                if entry.is_dir():
-                    continue
-                credentials.update(
-                    get_credentials(
-                        entry,
-                        encrypted_key_file=encrypted_key_file,
-                        verbose=verbose,
-                    )
-                )
+            entries = [entry for entry in files if not entry.is_dir()]
+            load = partial(_load_credentials_from_path, verbose=verbose)
+            # Reading keys is I/O bound, so threads overlap the file latency.
+            # They only read: decrypting (which may ask for a passphrase) is
+            # left to this thread, below.
+            with ThreadPoolExecutor(max_workers=max(1, min(16, len(entries)))) as executor:
+                for result in executor.map(load, entries):
+                    credentials.update(result)
         else:
             credentials.update(_load_credentials_from_path(path, verbose=verbose))
         return credentials
@@ -128,27 +183,79 @@ def to_numeric(value):
         return value
 
 
+def _surely_not_numeric(value) -> bool:
+    """True if *value* is text that :func:`pandas.to_numeric` can't parse.
+
+    Blank cells parse (as NaN), so they never rule a column out.
+    """
+    if not isinstance(value, str) or value == "":
+        return False
+    try:
+        float(value)
+    except ValueError:
+        return True
+    return False
+
+
+def _numeric_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Apply :func:`to_numeric` to each text column of *df*.
+
+    Columns are replaced in place on a shallow copy, so columns that are
+    already numeric (or can't be converted) are neither parsed nor copied.
+    A column whose first cell is plainly text (a label, a name) can't be
+    converted, so it is skipped without parsing the rest.
+    """
+    out = df.copy(deep=False)
+    if out.empty:  # e.g. a header-only sheet; leave its columns as they are
+        return out
+    first_row = out.iloc[0].tolist()
+    for i, dtype in enumerate(out.dtypes):
+        if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            if _surely_not_numeric(first_row[i]):
+                continue
+            column = out.iloc[:, i]
+            converted = to_numeric(column)
+            if converted is not column:
+                out.isetitem(i, converted)
+    return out
+
+
+_SHEET_ID_RE = re.compile(r"/d/([a-zA-Z0-9_-]+)")
+
+
+def _sheet_id(url: str) -> str:
+    """The spreadsheet id in a Google Sheets *url*."""
+    match = _SHEET_ID_RE.search(url)
+    if match is None:
+        raise ValueError("Unrecognized sheet URL format.")
+    return match.group(1)
+
+
+# Seconds to wait for a connection, and then between bytes of the export.
+_PUBLIC_SHEET_TIMEOUT = (10, 60)
+
+
 def read_public_sheet(key: str, sheet: Optional[str | int] = None) -> pd.DataFrame:
     """
     Read a public Google Sheet and return a :class:`pandas.DataFrame`.
     """
     if key.startswith("https://"):
-        parts = key.split("/")
-        try:
-            key = parts[parts.index("d") + 1]
-        except (ValueError, IndexError) as exc:
-            raise ValueError("Unrecognized sheet URL format.") from exc
+        key = _sheet_id(key)
 
     url = f"https://docs.google.com/spreadsheets/d/{key}/export?format=csv"
     if sheet is not None:
         url += f"&gid={str(sheet).replace(' ', '%20')}"
 
-    try:
-        df = pd.read_csv(url)
-    except HTTPError as exc:
-        raise HTTPError(f"Not found. Check permissions? {exc}") from exc
-
-    return df.drop([col for col in df.columns if col.startswith("Unnamed")], axis=1)
+    response = requests.get(url, headers={"Accept-Encoding": "gzip, deflate"}, stream=True,
+                            timeout=_PUBLIC_SHEET_TIMEOUT)
+    with response:
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as exc:
+            raise requests.HTTPError(f"Not found. Check permissions? {exc}", response=response) from exc
+        response.raw.decode_content = True  # Let urllib3 undo the gzip
+        # Blank header cells come back as "Unnamed: n"; don't parse them at all.
+        return pd.read_csv(response.raw, usecols=lambda col: not str(col).startswith("Unnamed"))
 
 
 def _raw_sheet_to_df(data, nheaders: int):
@@ -156,29 +263,95 @@ def _raw_sheet_to_df(data, nheaders: int):
     body = data[nheaders:]
 
     if nheaders > 1:
-        clean_headers = [header_row[:] for header_row in headers]
-        forward_header = [s.strip() for s in clean_headers[0]]
-        forward_header.reverse()
-        idxn = len(forward_header) - forward_header.index("")
+        # The index is the columns up to the last blank in the first header row.
+        stripped = [s.strip() for s in headers[0]]
+        idxn = len(stripped) - stripped[::-1].index("")
         idxnames = headers[-1][:idxn]
 
-        columns = pd.MultiIndex.from_arrays([h[idxn:] for h in headers])
+        # Rows are padded to a rectangle, so slice headers and body from one block.
+        arr = np.asarray(data, dtype=object).reshape(len(data), len(headers[0]))
+        columns = pd.MultiIndex.from_arrays(list(arr[:nheaders, idxn:]))
         if len(columns.levels) == 1:
             columns = columns.get_level_values(0)
 
-        index = [row[:idxn] for row in body]
-        values = [row[idxn:] for row in body]
-        index = pd.MultiIndex.from_tuples(index, names=idxnames)
+        index = pd.MultiIndex.from_arrays(list(arr[nheaders:, :idxn].T), names=idxnames)
         if len(index.levels) == 1:
             index = index.get_level_values(0)
-        return pd.DataFrame(values, index=index, columns=columns)
+        return pd.DataFrame(arr[nheaders:, idxn:], index=index, columns=columns).infer_objects()
 
     columns = pd.Index(headers[0])
     return pd.DataFrame(body, columns=columns)
 
 
+def _padded_values(value_range) -> list:
+    """Rows of a Sheets API ValueRange, padded to a rectangle like ``get_all_values``."""
+    values = value_range.get("values", [[]])
+    try:
+        return fill_gaps(values)
+    except KeyError:
+        return [[]]
+
+
+# Authorized clients, keyed on the credential files they were built from
+# (with modification times, so edited or replaced keys are re-read).
+_CLIENT_CACHE: Dict[tuple, Dict[str, gspread.Client]] = {}
+
+
+def _credentials_fingerprint(path: os.PathLike[str] | str) -> Optional[tuple]:
+    """``(path, mtime)`` pairs for the credential file(s) at *path*, or None if there are none."""
+    path = Path(path)
+    try:
+        entries = sorted(p for p in path.iterdir() if not p.is_dir()) if path.is_dir() else [path]
+        fingerprint = tuple((str(p.resolve()), p.stat().st_mtime_ns) for p in entries)
+    except OSError:
+        return None
+    return fingerprint or None
+
+
 def _authorize_clients(
     json_creds: Optional[str],
+) -> Dict[str, gspread.Client]:
+    fingerprint = _credentials_fingerprint(
+        json_creds if json_creds is not None else _default_key_destination()
+    )
+    if fingerprint in _CLIENT_CACHE:
+        return dict(_CLIENT_CACHE[fingerprint])
+
+    clients = _authorize_uncached(json_creds)
+    if clients and fingerprint is not None:
+        _CLIENT_CACHE[fingerprint] = dict(clients)
+    return clients
+
+
+# The service account that last opened each spreadsheet key or URL.
+_KEY_ACCOUNTS: Dict[str, str] = {}
+
+
+def _clients_for(key, clients: Dict[str, gspread.Client]):
+    """Items of *clients*, with the account known to open *key* first."""
+    account = _KEY_ACCOUNTS.get(key) if isinstance(key, str) else None
+    if account not in clients:
+        return list(clients.items())
+    return [(account, clients[account])] + [(a, c) for a, c in clients.items() if a != account]
+
+
+# One connection pool shared by every client, so trying several service
+# accounts (or making many calls) reuses open TLS connections to Google.
+_HTTP_ADAPTER = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+
+
+def _gspread_client(creds: Credentials) -> gspread.Client:
+    """Authorize a gspread client whose session uses the shared connection pool."""
+    client = gspread.authorize(creds)
+    # gspread >= 6 keeps its session on ``http_client``; older releases on the client.
+    session = getattr(getattr(client, "http_client", client), "session", None)
+    if session is not None:
+        session.mount("https://", _HTTP_ADAPTER)
+    return client
+
+
+def _authorize_uncached(
+    json_creds: Optional[str],
 ) -> Dict[str, gspread.Client]:
     scope = [
         "https://spreadsheets.google.com/feeds",
@@ -188,7 +361,7 @@ def _authorize_clients(
 
     if json_creds is not None:
         creds = Credentials.from_service_account_file(json_creds, scopes=scope)
-        clients[creds.service_account_email] = gspread.authorize(creds)
+        clients[creds.service_account_email] = _gspread_client(creds)
         return clients
 
     try:
@@ -197,7 +370,7 @@ def _authorize_clients(
             creds = Credentials.from_service_account_info(
                 service_account_info, scopes=scope
             )
-            clients[account_email] = gspread.authorize(creds)
+            clients[account_email] = _gspread_client(creds)
     except Exception:
         warnings.warn("Unable to access credentials. Trying without...")
 
@@ -232,16 +405,20 @@ def read_sheets(
     workbook = None
     active_client = None
 
-    for service_account, client in clients.items():
+    for service_account, client in _clients_for(key, clients):
         try:
             if isinstance(key, str) and key.startswith("https://"):
-                workbook = client.open_by_url(key)
+                workbook = _with_backoff(client.open_by_url, key)
             else:
-                workbook = client.open_by_key(key)  # type: ignore[arg-type]
-            workbook.worksheets()
+                workbook = _with_backoff(client.open_by_key, key)  # type: ignore[arg-type]
+            # Opening fetches the sheet metadata, so permission errors surface here.
             active_client = client
+            if isinstance(key, str):
+                _KEY_ACCOUNTS[key] = service_account
             break
         except (APIError, PermissionError):
+            if isinstance(key, str) and _KEY_ACCOUNTS.get(key) == service_account:
+                del _KEY_ACCOUNTS[key]
             warnings_raised.append(
                 f"Unable to open {key} using credentials for {service_account}."
             )
@@ -253,23 +430,31 @@ def read_sheets(
         raise RuntimeError(f"Unable to open {key} with available credentials.")
 
     if sheet is None:
+        # Opening the workbook doesn't keep its list of worksheets, so that
+        # takes one metadata request; the values of every worksheet then
+        # come in a single values.batchGet request.
+        worksheets = _with_backoff(workbook.worksheets)
+        response = _with_backoff(
+            workbook.values_batch_get,
+            [absolute_range_name(worksheet.title) for worksheet in worksheets],
+        )
         dataframes = {}
-        for worksheet in workbook.worksheets():
-            data = worksheet.get_all_values()
+        for worksheet, value_range in zip(worksheets, response.get("valueRanges", [])):
+            data = _padded_values(value_range)
             df = _raw_sheet_to_df(data, nheaders)
-            dataframes[worksheet.title] = df.apply(to_numeric) if force_numeric else df
+            dataframes[worksheet.title] = _numeric_columns(df) if force_numeric else df
         return dataframes
 
     try:
         sheet_index = int(sheet)
     except (TypeError, ValueError):
-        worksheet = workbook.worksheet(sheet)  # type: ignore[arg-type]
+        worksheet = _with_backoff(workbook.worksheet, sheet)  # type: ignore[arg-type]
     else:
-        worksheet = workbook.get_worksheet(sheet_index)
+        worksheet = _with_backoff(workbook.get_worksheet, sheet_index)
 
-    data = worksheet.get_all_values()
+    data = _with_backoff(worksheet.get_all_values)
     df = _raw_sheet_to_df(data, nheaders)
-    return df.apply(to_numeric) if force_numeric else df
+    return _numeric_columns(df) if force_numeric else df
 
 
 def _select_service_account_info(
@@ -280,13 +465,21 @@ def _select_service_account_info(
     return next(iter(creds.values()))
 
 
+def _sheet_values(df: pd.DataFrame) -> list:
+    """Header and body rows for *df*, laid out as ``Spread.df_to_sheet`` lays them out."""
+    index_size = df.index.nlevels
+    df = fillna(df.reset_index(), "")
+    rows = parse_df_col_names(df, True, index_size) + df.values.tolist()
+    return [[str(value) for value in row] for row in rows]
+
+
 def write_sheet(
     df: pd.DataFrame,
     user_email: str,
     user_role: str = "reader",
     json_creds: Optional[str] = None,
     key: str = "",
-    sheet: str = "My Sheet",
+    sheet: Optional[str] = "My Sheet",
 ) -> str:
     """
     Write ``df`` to Google Sheets, creating the sheet if necessary.
@@ -299,15 +492,11 @@ def write_sheet(
     ]
 
     if "http" in key and "/" in key:
-        parts = key.split("/")
-        try:
-            key = parts[parts.index("d") + 1]
-        except (ValueError, IndexError) as exc:
-            raise ValueError("Unrecognized sheet URL format.") from exc
+        key = _sheet_id(key)
 
     if json_creds is not None:
         credential_obj = Credentials.from_service_account_file(json_creds, scopes=scope)
-        gc = gspread.authorize(credential_obj)
+        gc = _gspread_client(credential_obj)
         service_credentials = credential_obj
     else:
         json_info = get_credentials()
@@ -318,13 +507,13 @@ def write_sheet(
         service_credentials = None
         for account_email, account_info in json_info.items():
             creds = Credentials.from_service_account_info(account_info, scopes=scope)
-            client = gspread.authorize(creds)
+            client = _gspread_client(creds)
             if not key:
                 # Creating a new sheet — any account will do.
                 gc, service_credentials = client, creds
                 break
             try:
-                client.open_by_key(key)
+                _with_backoff(client.open_by_key, key)
                 gc, service_credentials = client, creds
                 break
             except (APIError, PermissionError):
@@ -337,21 +526,36 @@ def write_sheet(
             )
 
     try:
-        spread = Spread(key, creds=service_credentials)
+        spread = _with_backoff(Spread, key, creds=service_credentials)
         spreadsheet_id = spread.url.split("/")[-1]
     except SpreadsheetNotFound:
-        spreadsheet = gc.create(key or "EEP153 Sheet")
+        spreadsheet = _with_backoff(gc.create, key or "EEP153 Sheet")
         spreadsheet_id = spreadsheet.id
-        spread = Spread(spreadsheet_id, creds=gc.auth)  # type: ignore[arg-type]
+        spread = _with_backoff(Spread, spreadsheet_id, creds=gc.auth)  # type: ignore[arg-type]
         try:
             worksheet = spreadsheet.sheet1
         except AttributeError:
             worksheet = None
         if worksheet is not None:
-            spreadsheet.del_worksheet(worksheet)
-
-    gc.insert_permission(spreadsheet_id, user_email, perm_type="user", role=user_role)
-    spread.df_to_sheet(df, sheet=sheet)
+            _with_backoff(spreadsheet.del_worksheet, worksheet)
+
+    _with_backoff(gc.insert_permission, spreadsheet_id, user_email, perm_type="user", role=user_role)
+
+    # Write every cell in one values.update call; df_to_sheet reads and
+    # writes the range in chunks, which large frames turn into many requests.
+    if sheet is not None:  # Otherwise the first worksheet, as df_to_sheet did
+        _with_backoff(spread.open_sheet, sheet, create=True)
+    worksheet = spread.sheet
+    values = _sheet_values(df)
+    nrows, ncols = len(values), len(values[0])
+    if nrows > worksheet.row_count or ncols > worksheet.col_count:
+        _with_backoff(worksheet.resize, max(nrows, worksheet.row_count), max(ncols, worksheet.col_count))
+    _with_backoff(
+        worksheet.update,
+        values=values,
+        range_name=f"A1:{rowcol_to_a1(nrows, ncols)}",
+        value_input_option=ValueInputOption.user_entered,
+    )
 
     return spreadsheet_id
 
@@ -372,16 +576,16 @@ def delete_sheet(
     workbook_key = key
     gc_client: Optional[gspread.Client] = None
 
-    for service_account, client in clients.items():
+    for service_account, client in _clients_for(key, clients):
         try:
             if workbook_key.startswith("https://"):
-                parts = workbook_key.split("/")
-                workbook_key = parts[parts.index("d") + 1]
-            workbook = client.open_by_key(workbook_key)
-            workbook.worksheets()
+                workbook_key = _sheet_id(workbook_key)
+            _with_backoff(client.open_by_key, workbook_key)
             gc_client = client
             break
         except (APIError, PermissionError):
+            if _KEY_ACCOUNTS.get(key) == service_account:
+                del _KEY_ACCOUNTS[key]
             warnings_raised.append(
                 f"Unable to open {key} using credentials for {service_account}."
             )
@@ -393,4 +597,5 @@ def delete_sheet(
         raise RuntimeError(f"Unable to open {key} with available credentials.")
 
     print(f"Deleting {workbook_key}.")
-    gc_client.del_spreadsheet(workbook_key)
+    _with_backoff(gc_client.del_spreadsheet, workbook_key)
+    _KEY_ACCOUNTS.pop(key, None)
@@ -1,8 +1,12 @@
 #!/usr/bin/env python3
 """Handy string functions.
 """
+import re
+
 from thefuzz import fuzz, process
 
+_WHITESPACE = re.compile(r'\s+')
+
 def normalized(s,case='lower'):
     """
     Normalizes the input string by performing several transformations:
@@ -11,7 +15,6 @@ def normalized(s,case='lower'):
     - Collapsing multiple white spaces into a single space
     - Replacing hyphens with spaces
     """
-    import re
     # Convert case
     if case=='lower':
         s = s.lower()
@@ -23,7 +26,7 @@ def normalized(s,case='lower'):
     # Replace hyphens with spaces
     s = s.replace('-', ' ')
     # Strip leading/trailing spaces and collapse multiple spaces
-    s = re.sub(r'\s+', ' ', s).strip()
+    s = _WHITESPACE.sub(' ', s).strip()
     return s
 
 def similar(str1, str2, similarity_threshold=85):
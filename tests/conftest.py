@@ -1,3 +1,10 @@
+import os
+import shutil
+import subprocess
+
+import pytest
+
+
 def pytest_addoption(parser):
     parser.addoption(
         "--show-tables",
@@ -14,9 +21,42 @@ def pytest_configure(config):
     )
 
 
-import pytest
-
-
 @pytest.fixture
 def show_tables(request):
     return request.config.getoption("--show-tables")
+
+
+@pytest.fixture(scope="session")
+def gnupg_home(tmp_path_factory):
+    """A GnuPG home holding a passphrase-less key for test@example.com.
+
+    Key generation is slow, so the keyring is made once per session.
+    """
+    gpg = shutil.which("gpg")
+    if gpg is None:
+        pytest.skip("gpg not installed")
+
+    home = tmp_path_factory.mktemp("gnupg")
+    env = os.environ.copy()
+    env["GNUPGHOME"] = str(home)
+    subprocess.run(
+        [
+            gpg,
+            "--batch",
+            "--yes",
+            "--homedir",
+            str(home),
+            "--pinentry-mode",
+            "loopback",
+            "--passphrase",
+            "",
+            "--quick-gen-key",
+            "test@example.com",
+            "default",
+            "default",
+            "0",
+        ],
+        check=True,
+        env=env,
+    )
+    return home
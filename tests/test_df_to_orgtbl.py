@@ -1,3 +1,5 @@
+import warnings
+
 import numpy as np
 import pandas as pd
 
@@ -107,6 +109,46 @@ def test_df_to_orgtbl_conf_intervals(show_tables):
         print("\nCI table:\n", out)
 
 
+def test_df_to_orgtbl_stars_only_where_tstats_exist(show_tables):
+    df = pd.DataFrame({"a": [2.0, 3.0], "b": [1.0, np.nan]}, index=["x", "y"])
+    tdf = pd.DataFrame({"a": [3.0, 1.7]}, index=["x", "y"])  # no t-stats for b
+
+    out = df_to_orgtbl(df, tdf=tdf, float_fmt="%.1f", math_delimiters=False)
+
+    assert out.splitlines()[2:] == [
+        "| x  | 2.0^{***} | 1.0 |",
+        "| y  | 3.0^{*} | --- |",
+    ]
+    if show_tables:
+        print("\nPartial stars table:\n", out)
+
+
+def test_df_to_orgtbl_multiindex_repeats_are_blank(show_tables):
+    index = pd.MultiIndex.from_tuples([("g1", "a"), ("g1", "b"), ("g2", "b")], names=["grp", "item"])
+    df = pd.DataFrame({"v": [1.0, 2.0, 3.0]}, index=index)
+
+    out = df_to_orgtbl(df, float_fmt="%.1f", math_delimiters=False)
+
+    assert out.splitlines()[2:] == [
+        "| g1 | a | 1.0 |",
+        "| | b | 2.0 |",
+        "| g2 | | 3.0 |",
+    ]
+    if show_tables:
+        print("\nMultiIndex table:\n", out)
+
+
+def test_df_to_orgtbl_warns_on_duplicate_index_unless_skipped():
+    df = pd.DataFrame({"v": [1.0, 2.0]}, index=["x", "x"])
+
+    with pytest.warns(UserWarning, match="index contains duplicates"):
+        df_to_orgtbl(df)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        df_to_orgtbl(df, skip_validate=True)
+
+
 if __name__ == "__main__":
     # Allow running via `python tests/test_df_to_orgtbl.py --show-tables`
     pytest.main([__file__, "--show-tables", "-s"])
@@ -1,6 +1,14 @@
+import base64
+import datetime
+import email
+import importlib
+import json
 import os
 
 import pytest
+from google.oauth2 import service_account
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.errors import HttpError
 
 from ligonlibrary.email_from_ligon import (
@@ -9,8 +17,11 @@ from ligonlibrary.email_from_ligon import (
     _as_email_content,
     _format_addresses,
     _compose_message,
-    _send_with_retry,
+    _encode_message,
+    _send_batched,
     _resolve_credentials_path,
+    _validate_html_body,
+    _authorize,
     email_from_ligon,
 )
 
@@ -23,6 +34,15 @@ def test_as_email_content_accepts_legacy_tuple():
     assert content.cc == ()
 
 
+def test_as_email_content_accepts_cc_list():
+    content = _as_email_content(EmailContent("Subject", "Body", cc=["cc@example.com"]))
+
+    assert content.cc == ("cc@example.com",)
+    _, raw = _encode_message("to@example.com", content, "from@example.com", {})
+    msg = email.message_from_bytes(base64.urlsafe_b64decode(raw))
+    assert msg["Cc"] == "cc@example.com"
+
+
 def test_resolve_credentials_prefers_env(monkeypatch, tmp_path):
     cred_file = tmp_path / "creds.json"
     cred_file.write_text("{}")
@@ -43,6 +63,95 @@ def test_resolve_credentials_falls_back_to_home(monkeypatch, tmp_path):
     assert _resolve_credentials_path() == cred_file
 
 
+SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
+
+
+def _token_json(token):
+    return json.dumps(
+        {
+            "token": token,
+            "refresh_token": "refresh",
+            "client_id": "id",
+            "client_secret": "secret",
+            "expiry": "2999-01-01T00:00:00Z",
+        }
+    )
+
+
+def test_authorize_reuses_saved_token(monkeypatch, tmp_path):
+    token_file = tmp_path / ".ligonlibrary" / "email_token.json"
+    token_file.parent.mkdir()
+    token_file.write_text(_token_json("saved"))
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    def no_flow(*args, **kwargs):
+        raise AssertionError("OAuth flow should not run when a token is saved")
+
+    monkeypatch.setattr(InstalledAppFlow, "from_client_secrets_file", no_flow)
+
+    assert _authorize(SCOPES).token == "saved"
+
+
+def test_authorize_saves_token_from_flow(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    cred_file = tmp_path / "creds.json"
+    cred_file.write_text("{}")
+    monkeypatch.setenv(ENV_EMAIL_CREDENTIALS, str(cred_file))
+
+    class FakeFlow:
+        def run_local_server(self, port):
+            return Credentials.from_authorized_user_info(json.loads(_token_json("fresh")), SCOPES)
+
+    monkeypatch.setattr(InstalledAppFlow, "from_client_secrets_file", lambda path, scopes: FakeFlow())
+
+    assert _authorize(SCOPES).token == "fresh"
+    token_file = tmp_path / ".ligonlibrary" / "email_token.json"
+    saved = json.loads(token_file.read_text())
+    assert saved["token"] == "fresh"
+    assert token_file.stat().st_mode & 0o777 == 0o600
+
+
+def test_authorize_refreshes_expired_token(monkeypatch, tmp_path):
+    token_file = tmp_path / ".ligonlibrary" / "email_token.json"
+    token_file.parent.mkdir()
+    token_file.write_text(_token_json("stale").replace("2999", "2000"))
+    token_file.chmod(0o644)
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    def refresh(self, request):
+        self.token = "refreshed"
+        self.expiry = datetime.datetime(2999, 1, 1)
+
+    monkeypatch.setattr(Credentials, "refresh", refresh)
+    monkeypatch.setattr(
+        InstalledAppFlow, "from_client_secrets_file", lambda *a, **k: pytest.fail("flow should not run")
+    )
+
+    assert _authorize(SCOPES).token == "refreshed"
+    assert json.loads(token_file.read_text())["token"] == "refreshed"
+    assert token_file.stat().st_mode & 0o777 == 0o600
+
+
+def test_authorize_uses_service_account_key_without_flow(monkeypatch, tmp_path):
+    key_file = tmp_path / "key.json"
+    key_file.write_text(json.dumps({"type": "service_account", "client_email": "robot@example.com"}))
+    monkeypatch.setenv(ENV_EMAIL_CREDENTIALS, str(key_file))
+    monkeypatch.setenv("HOME", str(tmp_path))
+    calls = []
+
+    def from_file(path, scopes, subject):
+        calls.append((path, scopes, subject))
+        return "delegated"
+
+    monkeypatch.setattr(service_account.Credentials, "from_service_account_file", from_file)
+    monkeypatch.setattr(
+        InstalledAppFlow, "from_client_secrets_file", lambda *a, **k: pytest.fail("flow should not run")
+    )
+
+    assert _authorize(SCOPES, subject="ligon@berkeley.edu") == "delegated"
+    assert calls == [(str(key_file), SCOPES, "ligon@berkeley.edu")]
+
+
 def test_compose_message_multipart_when_html_present():
     content = EmailContent("Subj", "Plain text", (), "<b>HTML</b>")
 
@@ -64,31 +173,74 @@ def test_compose_message_raises_on_mismatched_html():
         _compose_message("to@example.com", content, "from@example.com")
 
 
+def test_validate_html_body_skips_cdata_and_raw_text():
+    _validate_html_body("<div><![CDATA[ <b> </i> ]]><SCRIPT>if (a < b) { x = '<p>'; }</Script></div>")
+
+    with pytest.raises(ValueError, match="Unclosed"):
+        _validate_html_body("<div><![CDATA[ </div> ]]>")
+
+
+def test_encode_message_composes_shared_content_once(monkeypatch):
+    module = importlib.import_module("ligonlibrary.email_from_ligon")
+
+    composed = []
+    compose = module._compose_message
+
+    def counting_compose(*args):
+        composed.append(args)
+        return compose(*args)
+
+    monkeypatch.setattr(module, "_compose_message", counting_compose)
+    content = EmailContent("Subj", "Same for all", ("cc@example.com",), "<p>Same</p>")
+    templates = {}
+
+    encoded = [
+        _encode_message(to, content, "from@example.com", templates)
+        for to in ("a@example.com", "Bee <b@example.com>")
+    ]
+
+    assert len(composed) == 1
+    assert [to for to, _ in encoded] == ["a@example.com", "Bee <b@example.com>"]
+    msg = email.message_from_bytes(base64.urlsafe_b64decode(encoded[1][1]))
+    assert msg.get_all("To") == ["Bee <b@example.com>"]
+    assert msg["Cc"] == "cc@example.com"
+    assert msg["Subject"] == "Subj"
+    assert msg.get_payload()[1].get_payload(decode=True).decode() == "<p>Same</p>"
+
+
 def test_format_addresses_parses_display_names():
     formatted = _format_addresses(["Name <user@example.com>", "other@example.com"])
     assert formatted == "Name <user@example.com>, other@example.com"
 
 
-def test_send_with_retry_backoff(monkeypatch):
-    calls = []
-
+def test_send_batched_chunks_and_retries_rate_limits(monkeypatch):
     class FakeResp:
         status = 429
         reason = "Too Many Requests"
 
-    class FakeSend:
-        def __init__(self):
-            self.count = 0
+    batches = []
+    limited_once = {"3"}
+
+    class FakeBatch:
+        def __init__(self, callback):
+            self.callback = callback
+            self.requests = []
+
+        def add(self, request, request_id):
+            self.requests.append(request_id)
 
         def execute(self):
-            self.count += 1
-            if self.count < 3:
-                exc = HttpError(FakeResp(), b"rate limit")
-                raise exc
-            return {"id": "ok"}
+            batches.append(self.requests)
+            for request_id in self.requests:
+                if request_id in limited_once:
+                    limited_once.discard(request_id)
+                    self.callback(request_id, None, HttpError(FakeResp(), b"rate limit"))
+                else:
+                    self.callback(request_id, {"id": f"msg{request_id}"}, None)
 
     class FakeService:
-        _sender = FakeSend()
+        def new_batch_http_request(self, callback):
+            return FakeBatch(callback)
 
         def users(self):
             return self
@@ -97,15 +249,42 @@ def test_send_with_retry_backoff(monkeypatch):
             return self
 
         def send(self, userId, body):
-            calls.append((userId, body))
-            return self._sender
+            return body
 
-    # Make time.sleep a no-op to keep test fast
     monkeypatch.setattr("time.sleep", lambda *_: None)
 
-    out = _send_with_retry(FakeService(), {"raw": "x"}, max_retries=3, base_sleep=0)
-    assert out == {"id": "ok"}
-    assert calls[0][0] == "me"
+    bodies = {str(i): {"raw": str(i)} for i in range(120)}
+    out = _send_batched(FakeService(), bodies, base_sleep=0)
+
+    assert [len(b) for b in batches] == [50, 50, 20, 1]
+    assert batches[-1] == ["3"]
+    assert out == {str(i): {"id": f"msg{i}"} for i in range(120)}
+
+
+def test_email_from_ligon_raises_after_failed_sends(monkeypatch):
+    module = importlib.import_module("ligonlibrary.email_from_ligon")
+
+    class FakeResp:
+        status = 400
+        reason = "Bad Request"
+
+    error = HttpError(FakeResp(), b"bad")
+    sent = []
+
+    def send_batched(service, bodies):
+        sent.extend(bodies)
+        return {"0": {"id": "ok"}, "1": error}
+
+    monkeypatch.setattr(module, "_authorize", lambda *a, **k: None)
+    monkeypatch.setattr(module, "build", lambda *a, **k: None)
+    monkeypatch.setattr(module, "_send_batched", send_batched)
+
+    with pytest.raises(HttpError) as raised:
+        email_from_ligon({"a@example.com": ("S", "B"), "b@example.com": ("S", "B")})
+
+    assert raised.value is error
+    assert sent == ["0", "1"]
+    assert "b@example.com" in raised.value.__notes__[0]
 
 
 @pytest.mark.skipif(
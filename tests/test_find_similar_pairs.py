@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ligonlibrary.dataframes import _greedy_assignment, find_similar_pairs
+
+
+def test_find_similar_pairs_matches_close_strings():
+    s1 = pd.Series(["New York", "Los Angeles", "San Fransisco", "Chicago", None])
+    s2 = pd.Series(["new york city", "los angeles", "san francisco", "boston"])
+
+    out = find_similar_pairs(s1, s2)
+
+    assert out == {
+        "New York": "new york city",
+        "Los Angeles": "los angeles",
+        "San Fransisco": "san francisco",
+    }
+
+
+def test_find_similar_pairs_respects_threshold():
+    out = find_similar_pairs(["New York"], ["new york city"], similarity_threshold=95)
+
+    assert out == {}
+
+
+def test_find_similar_pairs_uses_each_s2_at_most_once():
+    out = find_similar_pairs(["colour", "color"], ["color"])
+
+    assert out == {"color": "color"}
+
+
+def test_find_similar_pairs_empty_input():
+    assert find_similar_pairs(pd.Series([], dtype=object), ["anything"]) == {}
+
+
+def test_find_similar_pairs_prefers_assignment_matching_more_pairs():
+    pytest.importorskip("scipy")
+
+    out = find_similar_pairs(["jon smith", "jonn smith"], ["john smith", "jon smyth"])
+
+    assert out == {"jon smith": "jon smyth", "jonn smith": "john smith"}
+
+
+def test_greedy_assignment_uses_each_column_once():
+    scores = np.array([[95.0, 89.0], [90.0, 0.0]])
+
+    rows, cols = _greedy_assignment(scores)
+
+    assert list(zip(rows, cols)) == [(0, 0), (1, 1)]
+
+
+def test_find_similar_pairs_only_compares_within_blocks():
+    s1 = ["Berkeley", "Oakland"]
+    s2 = ["berkely", "oakland ca", "okland"]
+
+    out = find_similar_pairs(s1, s2, block=lambda s: s[:1].lower())
+
+    assert out == {"Berkeley": "berkely", "Oakland": "oakland ca"}
+    assert find_similar_pairs(["Oakland"], ["oakland"], block=lambda s: s[0]) == {}
+
+
+def test_find_similar_pairs_processes_each_string_once():
+    calls = []
+
+    def processor(s):
+        calls.append(s)
+        return s.lower().replace("-", " ")
+
+    out = find_similar_pairs(["Jean-Paul", "Anne-Marie"], ["jean paul", "anne marie", "john"], processor=processor)
+
+    assert out == {"Jean-Paul": "jean paul", "Anne-Marie": "anne marie"}
+    assert sorted(calls) == sorted(["Jean-Paul", "Anne-Marie", "jean paul", "anne marie", "john"])
+
+
+def test_find_similar_pairs_same_result_with_one_worker():
+    s1 = ["Berkeley", "Oakland", "Albany", "Emeryville"]
+    s2 = ["berkely", "oakland", "albany ca", "emeryvile"]
+
+    threaded = find_similar_pairs(s1, s2, block=lambda s: s[:1].lower())
+    serial = find_similar_pairs(s1, s2, block=lambda s: s[:1].lower(), workers=1)
+
+    assert threaded == serial
+    assert len(serial) == 4
+
+
+def test_find_similar_pairs_ignores_duplicates_and_missing_in_lists():
+    out = find_similar_pairs(["Los Angeles", None, "New York", "Los Angeles"], ("los angeles", "new york"))
+
+    assert list(out.items()) == [("Los Angeles", "los angeles"), ("New York", "new york")]
+
+
+def test_find_similar_pairs_accepts_similar_callable():
+    from ligonlibrary.strings import similar
+
+    out = find_similar_pairs(["New-York", "Boston"], ["new york", "austin"], similar=similar)
+
+    assert out == {"New-York": "new york"}
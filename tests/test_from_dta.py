@@ -38,6 +38,19 @@ def test_from_dta_categories_only(tmp_path):
     assert cats["item"] == labels["item"]
 
 
+def test_from_dta_categories_only_skips_the_data(tmp_path, monkeypatch):
+    path = tmp_path / "sample.dta"
+    labels = _write_sample_dta(path)
+
+    def no_read(self, *args, **kwargs):
+        raise AssertionError("data rows should not be read")
+
+    monkeypatch.setattr(pd.io.stata.StataReader, "read", no_read)
+
+    assert from_dta(path, categories_only=True) == {"item": labels["item"]}
+    assert from_dta(path, categories_only=True, columns=["id"]) == {}
+
+
 def test_from_dta_file_like(tmp_path):
     path = tmp_path / "sample.dta"
     _write_sample_dta(path)
@@ -46,3 +59,25 @@ def test_from_dta_file_like(tmp_path):
         out = from_dta(handle, convert_categoricals=False)
 
     assert out["item"].tolist() == [1, 2]
+
+
+def test_from_dta_categorical_labels(tmp_path):
+    path = tmp_path / "sample.dta"
+    _write_sample_dta(path)
+
+    out = from_dta(path, convert_categoricals="category")
+
+    assert isinstance(out["item"].dtype, pd.CategoricalDtype)
+    assert out["item"].tolist() == ["beans", "rice"]
+    assert list(out["item"].cat.categories) == ["beans", "rice"]
+    assert out["quantity"].tolist() == [3.5, 4.25]
+
+
+def test_from_dta_categorical_keeps_unlabelled_values(tmp_path):
+    path = tmp_path / "sample.dta"
+    df = pd.DataFrame({"item": [1, 2, 3]})
+    df.to_stata(path, write_index=False, value_labels={"item": {1: "beans", 2: "rice"}})
+
+    out = from_dta(path, convert_categoricals="category")
+
+    assert out["item"].tolist() == ["beans", "rice", 3]
@@ -1,3 +1,4 @@
+import gzip
 import io
 import os
 import shutil
@@ -10,7 +11,16 @@ try:
 except ImportError:  # pragma: no cover - optional dependency
     magic = None
 
-from ligonlibrary.dataframes import get_dataframe
+from ligonlibrary.dataframes import get_dataframe, get_dataframes
+
+
+def _raiser(exc):
+    """A stand-in reader that always fails with *exc*."""
+
+    def reader(*args, **kwargs):
+        raise exc
+
+    return reader
 
 
 def test_get_dataframe_uses_excel_sheet(tmp_path, monkeypatch):
@@ -39,12 +49,12 @@ def test_sheet_name_is_passed_to_read_excel_for_path(tmp_path, monkeypatch):
     pd.DataFrame({"col": [1]}).to_excel(excel_file, index=False, sheet_name="sheety")
 
     # Force all earlier readers to fail so read_excel is reached.
-    monkeypatch.setattr(pd, "read_spss", lambda *_, **__: (_ for _ in ()).throw(ValueError("no spss")))
-    monkeypatch.setattr(pd, "read_parquet", lambda *_, **__: (_ for _ in ()).throw(ImportError("no pyarrow")))
-    monkeypatch.setattr("ligonlibrary.dataframes.from_dta", lambda *_, **__: (_ for _ in ()).throw(ValueError("no dta")))
-    monkeypatch.setattr(pd, "read_csv", lambda *_, **__: (_ for _ in ()).throw(pd.errors.ParserError("bad csv")))
-    monkeypatch.setattr(pd, "read_feather", lambda *_, **__: (_ for _ in ()).throw(ImportError("no feather")))
-    monkeypatch.setattr(pd, "read_fwf", lambda *_, **__: (_ for _ in ()).throw(pd.errors.ParserError("bad fwf")))
+    monkeypatch.setattr(pd, "read_spss", _raiser(ValueError("no spss")))
+    monkeypatch.setattr(pd, "read_parquet", _raiser(ImportError("no pyarrow")))
+    monkeypatch.setattr("ligonlibrary.dataframes.from_dta", _raiser(ValueError("no dta")))
+    monkeypatch.setattr(pd, "read_csv", _raiser(pd.errors.ParserError("bad csv")))
+    monkeypatch.setattr(pd, "read_feather", _raiser(ImportError("no feather")))
+    monkeypatch.setattr(pd, "read_fwf", _raiser(pd.errors.ParserError("bad fwf")))
 
     called = {}
 
@@ -69,11 +79,11 @@ def test_sheet_name_is_passed_to_read_excel_for_buffer(tmp_path, monkeypatch):
         excel_bytes = f.read()
 
     # Disable upstream readers
-    monkeypatch.setattr(pd, "read_parquet", lambda *_, **__: (_ for _ in ()).throw(ImportError("no pyarrow")))
-    monkeypatch.setattr("ligonlibrary.dataframes.from_dta", lambda *_, **__: (_ for _ in ()).throw(ValueError("no dta")))
-    monkeypatch.setattr(pd, "read_csv", lambda *_, **__: (_ for _ in ()).throw(pd.errors.ParserError("bad csv")))
-    monkeypatch.setattr(pd, "read_feather", lambda *_, **__: (_ for _ in ()).throw(ImportError("no feather")))
-    monkeypatch.setattr(pd, "read_fwf", lambda *_, **__: (_ for _ in ()).throw(pd.errors.ParserError("bad fwf")))
+    monkeypatch.setattr(pd, "read_parquet", _raiser(ImportError("no pyarrow")))
+    monkeypatch.setattr("ligonlibrary.dataframes.from_dta", _raiser(ValueError("no dta")))
+    monkeypatch.setattr(pd, "read_csv", _raiser(pd.errors.ParserError("bad csv")))
+    monkeypatch.setattr(pd, "read_feather", _raiser(ImportError("no feather")))
+    monkeypatch.setattr(pd, "read_fwf", _raiser(pd.errors.ParserError("bad fwf")))
 
     called = {}
 
@@ -105,11 +115,11 @@ def test_non_seekable_stream_is_buffered(monkeypatch):
     buffer = NonSeekable(csv_bytes)
 
     # Force fallthrough to CSV reader.
-    monkeypatch.setattr(pd, "read_parquet", lambda *_, **__: (_ for _ in ()).throw(ImportError("no pyarrow")))
-    monkeypatch.setattr("ligonlibrary.dataframes.from_dta", lambda *_, **__: (_ for _ in ()).throw(ValueError("no dta")))
-    monkeypatch.setattr(pd, "read_excel", lambda *_, **__: (_ for _ in ()).throw(ValueError("no excel")))
-    monkeypatch.setattr(pd, "read_feather", lambda *_, **__: (_ for _ in ()).throw(ImportError("no feather")))
-    monkeypatch.setattr(pd, "read_fwf", lambda *_, **__: (_ for _ in ()).throw(pd.errors.ParserError("bad fwf")))
+    monkeypatch.setattr(pd, "read_parquet", _raiser(ImportError("no pyarrow")))
+    monkeypatch.setattr("ligonlibrary.dataframes.from_dta", _raiser(ValueError("no dta")))
+    monkeypatch.setattr(pd, "read_excel", _raiser(ValueError("no excel")))
+    monkeypatch.setattr(pd, "read_feather", _raiser(ImportError("no feather")))
+    monkeypatch.setattr(pd, "read_fwf", _raiser(pd.errors.ParserError("bad fwf")))
 
     get_dataframe.cache_clear()
     df = get_dataframe(buffer)
@@ -118,51 +128,21 @@ def test_non_seekable_stream_is_buffered(monkeypatch):
     assert df.iloc[0, 0] == 3
 
 
-def test_get_dataframe_decrypts_pgp_file(tmp_path, monkeypatch):
-    gpg = shutil.which("gpg")
-    if gpg is None:
-        pytest.skip("gpg not installed")
-
-    gnupg_home = tmp_path / "gnupg"
-    gnupg_home.mkdir()
+def _encrypt(gnupg_home, plaintext, ciphertext):
+    """Encrypt *plaintext* to the test key in *gnupg_home*, uncompressed."""
     env = os.environ.copy()
     env["GNUPGHOME"] = str(gnupg_home)
-
-    # Create a key without a passphrase for non-interactive decrypt.
     subprocess.run(
         [
-            gpg,
-            "--batch",
-            "--yes",
-            "--homedir",
-            str(gnupg_home),
-            "--pinentry-mode",
-            "loopback",
-            "--passphrase",
-            "",
-            "--quick-gen-key",
-            "test@example.com",
-            "default",
-            "default",
-            "0",
-        ],
-        check=True,
-        env=env,
-    )
-
-    plaintext = tmp_path / "data.csv"
-    plaintext.write_text("col\n4\n", encoding="utf-8")
-    ciphertext = tmp_path / "data.csv.gpg"
-
-    subprocess.run(
-        [
-            gpg,
+            shutil.which("gpg"),
             "--batch",
             "--yes",
             "--homedir",
             str(gnupg_home),
             "--trust-model",
             "always",
+            "--compress-algo",
+            "none",
             "--recipient",
             "test@example.com",
             "--output",
@@ -174,6 +154,13 @@ def test_get_dataframe_decrypts_pgp_file(tmp_path, monkeypatch):
         env=env,
     )
 
+
+def test_get_dataframe_decrypts_pgp_file(tmp_path, monkeypatch, gnupg_home):
+    plaintext = tmp_path / "data.csv"
+    plaintext.write_text("col\n4\n", encoding="utf-8")
+    ciphertext = tmp_path / "data.csv.gpg"
+    _encrypt(gnupg_home, plaintext, ciphertext)
+
     monkeypatch.setenv("GNUPGHOME", str(gnupg_home))
     get_dataframe.cache_clear()
     df = get_dataframe(ciphertext)
@@ -182,6 +169,22 @@ def test_get_dataframe_decrypts_pgp_file(tmp_path, monkeypatch):
     assert df.iloc[0, 0] == 4
 
 
+def test_get_dataframe_decrypts_pgp_file_larger_than_read_buffer(tmp_path, monkeypatch, gnupg_home):
+    # Sniffing the header fills the file's read buffer, leaving the
+    # descriptor gpg reads from well past the start of the ciphertext.
+    plaintext = tmp_path / "big.csv"
+    plaintext.write_text("col\n" + "".join(f"{i}\n" for i in range(20000)), encoding="utf-8")
+    ciphertext = tmp_path / "big.csv.gpg"
+    _encrypt(gnupg_home, plaintext, ciphertext)
+    assert ciphertext.stat().st_size > 8192
+
+    monkeypatch.setenv("GNUPGHOME", str(gnupg_home))
+    get_dataframe.cache_clear()
+    df = get_dataframe(ciphertext)
+
+    assert df["col"].tolist() == list(range(20000))
+
+
 def test_magic_prioritizes_excel_over_csv(tmp_path, monkeypatch):
     if magic is None:
         pytest.skip("python-magic not installed")
@@ -209,3 +212,440 @@ def test_magic_prioritizes_excel_over_csv(tmp_path, monkeypatch):
     assert calls[0] == ("excel", "sheety")
     assert list(df.columns) == ["col"]
     assert df.iloc[0, 0] == 5
+
+
+def test_magic_scans_each_header_once(tmp_path, monkeypatch):
+    if magic is None:
+        pytest.skip("python-magic not installed")
+    csv_file = tmp_path / "data.csv"
+    csv_file.write_text("col\n8\n", encoding="utf-8")
+
+    calls = []
+
+    def counting_from_buffer(buffer, mime=False):
+        calls.append(mime)
+        return "text/plain" if mime else "CSV text"
+
+    monkeypatch.setattr(magic, "from_buffer", counting_from_buffer)
+
+    get_dataframe.cache_clear()
+    df = get_dataframe(csv_file)
+
+    assert df.iloc[0, 0] == 8
+    assert sorted(calls) == [False, True]
+
+
+def test_magic_bytes_dispatch_skips_other_readers(tmp_path, monkeypatch):
+    stata_file = tmp_path / "sample.dat"  # Extension gives no hint
+    pd.DataFrame({"col": [6]}).to_stata(stata_file, write_index=False)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("only the Stata reader should be tried")
+
+    for reader in ["read_spss", "read_parquet", "read_csv", "read_excel", "read_feather", "read_fwf"]:
+        monkeypatch.setattr(pd, reader, fail)
+
+    get_dataframe.cache_clear()
+    df = get_dataframe(stata_file)
+
+    assert list(df.columns) == ["col"]
+    assert df.iloc[0, 0] == 6
+
+
+def test_text_file_skips_binary_readers(tmp_path, monkeypatch):
+    data_file = tmp_path / "data.txt"  # Extension gives no hint
+    data_file.write_text("col\n7\n", encoding="utf-8")
+
+    tried = []
+
+    def fail(*args, **kwargs):
+        tried.append(args)
+        raise ValueError("not this format")
+
+    for reader in ["read_parquet", "read_excel", "read_feather"]:
+        monkeypatch.setattr(pd, reader, fail)
+    monkeypatch.setattr("ligonlibrary.dataframes.from_dta", fail)
+
+    get_dataframe.cache_clear()
+    df = get_dataframe(data_file)
+
+    assert df["col"].tolist() == [7]
+    assert tried == []
+
+
+def test_empty_input_gives_empty_dataframe(tmp_path):
+    empty_file = tmp_path / "empty.csv"
+    empty_file.write_bytes(b"")
+
+    get_dataframe.cache_clear()
+    for source in (empty_file, io.BytesIO(b"")):
+        df = get_dataframe(source)
+        assert isinstance(df, pd.DataFrame)
+        assert df.empty
+
+
+def test_directory_is_not_read_as_empty(tmp_path):
+    get_dataframe.cache_clear()
+    for _ in range(2):  # Nor is an empty frame cached for it
+        with pytest.raises(IsADirectoryError):
+            get_dataframe(tmp_path)
+
+
+def test_failed_header_read_is_not_taken_for_empty_input():
+    class NoRead(io.BytesIO):  # The readers still get at it through readinto()
+        def read(self, *args):
+            raise OSError("device not ready")
+
+    get_dataframe.cache_clear()
+    assert get_dataframe(NoRead(b"col\n1\n"))["col"].tolist() == [1]
+
+
+def test_get_dataframe_caches_until_file_changes(tmp_path, monkeypatch):
+    csv_file = tmp_path / "data.csv"
+    csv_file.write_text("col\n7\n", encoding="utf-8")
+
+    calls = []
+    read_csv = pd.read_csv
+
+    def counting_read_csv(*args, **kwargs):
+        calls.append(args)
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", counting_read_csv)
+
+    get_dataframe.cache_clear()
+    first = get_dataframe(csv_file)
+    again = get_dataframe(csv_file)
+
+    assert again is not first  # A copy, so changes to it can't reach the cache
+    pd.testing.assert_frame_equal(again, first)
+    assert len(calls) == 1
+
+    again["col"] = 0
+    assert get_dataframe(csv_file)["col"].tolist() == [7]
+    again = get_dataframe(csv_file)
+    again.loc[0, "col"] = 0
+    again.iloc[0, 0] = 0
+    assert get_dataframe(csv_file)["col"].tolist() == [7]
+
+    csv_file.write_text("col\n8\n9\n", encoding="utf-8")
+    changed = get_dataframe(csv_file)
+
+    assert changed["col"].tolist() == [8, 9]
+    assert len(calls) == 2
+
+
+def test_get_dataframe_caches_buffers_on_their_contents(monkeypatch):
+    calls = []
+    read_csv = pd.read_csv
+
+    def counting_read_csv(*args, **kwargs):
+        calls.append(args)
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", counting_read_csv)
+
+    get_dataframe.cache_clear()
+    first = get_dataframe(io.BytesIO(b"col\n7\n"))
+    again = get_dataframe(io.BytesIO(b"col\n7\n"))
+    other = get_dataframe(io.BytesIO(b"col\n8\n"))
+
+    assert again["col"].tolist() == [7]
+    assert other["col"].tolist() == [8]
+    assert len(calls) == 2
+    assert again is not first
+
+
+def test_cache_accepts_array_like_arguments(tmp_path, monkeypatch):
+    import numpy as np
+
+    from ligonlibrary.dataframes import _cache_token
+
+    csv_file = tmp_path / "data.csv"
+    csv_file.write_text("a,b\n1,2\n", encoding="utf-8")
+    calls = []
+    read_csv = pd.read_csv
+
+    def counting_read_csv(*args, **kwargs):
+        calls.append(args)
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_csv", counting_read_csv)
+
+    get_dataframe.cache_clear()
+    for columns in (pd.Index(["a"]), np.array(["a"]), ["a"]):
+        assert list(get_dataframe(csv_file, columns=columns).columns) == ["a"]
+    assert len(calls) == 1
+    assert _cache_token({1: "x"}) != _cache_token({"1": "x"})
+
+
+def test_get_dataframe_remembers_reader_for_path(tmp_path, monkeypatch):
+    data_file = tmp_path / "data.txt"  # Extension gives no hint
+    data_file.write_text("col\n7\n", encoding="utf-8")
+
+    get_dataframe.cache_clear()
+    get_dataframe(data_file)
+
+    tried = []
+
+    def fail(*args, **kwargs):
+        tried.append(args)
+        raise ValueError("not this format")
+
+    for reader in ["read_parquet", "read_excel", "read_feather", "read_fwf"]:
+        monkeypatch.setattr(pd, reader, fail)
+    monkeypatch.setattr("ligonlibrary.dataframes.from_dta", fail)
+
+    data_file.write_text("col\n8\n9\n", encoding="utf-8")
+    changed = get_dataframe(data_file)
+
+    assert changed["col"].tolist() == [8, 9]
+    assert tried == []
+
+
+def test_prefer_arrow_reads_parquet_with_arrow_dtypes(tmp_path):
+    pytest.importorskip("pyarrow")
+    parquet_file = tmp_path / "data.parquet"
+    pd.DataFrame({"col": [1, 2], "name": ["a", "b"]}).to_parquet(parquet_file)
+
+    get_dataframe.cache_clear()
+    df = get_dataframe(parquet_file, prefer="arrow")
+
+    assert df["col"].tolist() == [1, 2]
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes)
+
+
+def test_prefer_arrow_csv_falls_back_to_c_parser(tmp_path):
+    pytest.importorskip("pyarrow")
+    csv_file = tmp_path / "short_rows.csv"
+    csv_file.write_text("a,b\n1,2\n3\n", encoding="utf-8")  # pyarrow rejects the short row
+
+    get_dataframe.cache_clear()
+    df = get_dataframe(csv_file, prefer="arrow")
+
+    assert df["a"].tolist() == [1, 3]
+    assert df["b"].isna().tolist() == [False, True]
+    assert isinstance(df["a"].dtype, pd.ArrowDtype)
+
+
+def test_prefer_rejects_unknown_backend(tmp_path):
+    with pytest.raises(ValueError):
+        get_dataframe(tmp_path / "missing.csv", prefer="polars")
+
+
+def test_remote_stream_is_fetched_once(monkeypatch):
+    class RemoteFile(io.RawIOBase):
+        """Seekable stream without a local descriptor, like an fsspec file."""
+
+        def __init__(self, data):
+            self.data = data
+            self.pos = 0
+            self.reads = 0
+
+        def readable(self):
+            return True
+
+        def seekable(self):
+            return True
+
+        def seek(self, pos, whence=0):
+            self.pos = pos
+            return pos
+
+        def read(self, size=-1):
+            self.reads += 1
+            chunk = self.data[self.pos:] if size < 0 else self.data[self.pos:self.pos + size]
+            self.pos += len(chunk)
+            return chunk
+
+    remote = RemoteFile(b"col\n4\n")
+
+    monkeypatch.setattr(pd, "read_parquet", _raiser(ValueError("no parquet")))
+    monkeypatch.setattr("ligonlibrary.dataframes.from_dta", _raiser(ValueError("no dta")))
+
+    get_dataframe.cache_clear()
+    df = get_dataframe(remote)
+
+    assert df.iloc[0, 0] == 4
+    assert remote.reads == 1
+
+
+def test_spss_reader_not_tried_without_hint(tmp_path, monkeypatch):
+    csv_file = tmp_path / "data.txt"
+    csv_file.write_text("col\n5\n", encoding="utf-8")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("read_spss should not be tried")
+
+    monkeypatch.setattr(pd, "read_spss", fail)
+
+    get_dataframe.cache_clear()
+    df = get_dataframe(csv_file)
+
+    assert df.iloc[0, 0] == 5
+
+
+def test_large_spss_file_is_read_in_parallel(tmp_path, monkeypatch):
+    pyreadstat = pytest.importorskip("pyreadstat")
+    sav_file = tmp_path / "survey.sav"
+    pyreadstat.write_sav(pd.DataFrame({"col": [1.0, 2.0, 3.0]}), str(sav_file))
+
+    calls = []
+    read_file_multiprocessing = pyreadstat.read_file_multiprocessing
+
+    def counting(*args, **kwargs):
+        calls.append(kwargs)
+        return read_file_multiprocessing(*args, **kwargs)
+
+    monkeypatch.setattr(pyreadstat, "read_file_multiprocessing", counting)
+    monkeypatch.setattr("ligonlibrary.dataframes._SPSS_PARALLEL_BYTES", 0)
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+
+    get_dataframe.cache_clear()
+    df = get_dataframe(sav_file)
+
+    assert df["col"].tolist() == [1.0, 2.0, 3.0]
+    assert calls and calls[0]["num_processes"] == 2
+
+
+def test_excel_uses_calamine_when_available(tmp_path, monkeypatch):
+    pytest.importorskip("python_calamine")
+    excel_file = tmp_path / "sample.xlsx"
+    pd.DataFrame({"col": [1]}).to_excel(excel_file, index=False)
+
+    engines = []
+    read_excel = pd.read_excel
+
+    def recording_read_excel(*args, **kwargs):
+        engines.append(kwargs.get("engine"))
+        return read_excel(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_excel", recording_read_excel)
+
+    get_dataframe.cache_clear()
+    df = get_dataframe(excel_file)
+
+    assert engines == ["calamine"]
+    assert df.iloc[0, 0] == 1
+
+
+def test_columns_and_filters_are_pushed_into_parquet_read(tmp_path):
+    pytest.importorskip("pyarrow")
+    parquet_file = tmp_path / "wide.parquet"
+    pd.DataFrame({"year": [2009, 2010, 2011], "x": [1, 2, 3], "y": [4, 5, 6]}).to_parquet(parquet_file)
+
+    get_dataframe.cache_clear()
+    df = get_dataframe(parquet_file, columns=["year", "x"], filters=[("year", ">=", 2010)])
+
+    assert list(df.columns) == ["year", "x"]
+    assert df["x"].tolist() == [2, 3]
+
+
+def test_get_dataframes_reads_each_path(tmp_path):
+    pytest.importorskip("pyarrow")
+    parquet_file = tmp_path / "a.parquet"
+    csv_file = tmp_path / "b.csv"
+    pd.DataFrame({"col": [1, 2], "other": [3, 4]}).to_parquet(parquet_file)
+    pd.DataFrame({"col": [5, 6], "other": [7, 8]}).to_csv(csv_file, index=False)
+
+    get_dataframe.cache_clear()
+    frames = get_dataframes([str(parquet_file), csv_file, parquet_file], columns=["col"])
+
+    assert list(frames) == [parquet_file, csv_file]
+    assert frames[parquet_file]["col"].tolist() == [1, 2]
+    assert frames[csv_file]["col"].tolist() == [5, 6]
+    assert list(frames[csv_file].columns) == ["col"]
+    assert get_dataframes([]) == {}
+
+
+def test_columns_subset_stata_file(tmp_path):
+    stata_file = tmp_path / "wide.dta"
+    pd.DataFrame({"a": [1], "b": [2], "c": [3]}).to_stata(stata_file, write_index=False)
+
+    get_dataframe.cache_clear()
+    df = get_dataframe(stata_file, columns=["c", "a"])
+
+    assert sorted(df.columns) == ["a", "c"]
+
+
+def test_filters_rejected_for_non_parquet(tmp_path):
+    stata_file = tmp_path / "sample.dta"
+    pd.DataFrame({"a": [1]}).to_stata(stata_file, write_index=False)
+
+    csv_file = tmp_path / "sample.csv"
+    csv_file.write_text("a\n1\n", encoding="utf-8")
+
+    get_dataframe.cache_clear()
+    for path in (stata_file, csv_file):
+        with pytest.raises(ValueError, match="only supported for parquet"):
+            get_dataframe(path, filters=[("a", "==", 1)])
+
+
+def test_missing_file_raises_file_not_found(tmp_path):
+    get_dataframe.cache_clear()
+    with pytest.raises(FileNotFoundError):
+        get_dataframe(tmp_path / "missing.csv")
+
+
+def test_gzipped_files_are_read_by_their_contents(tmp_path):
+    gz_file = tmp_path / "data.csv.gz"
+    gz_file.write_bytes(gzip.compress(b"a,b\n1,2\n"))
+    parquet = io.BytesIO()
+    pd.DataFrame({"x": [3, 4]}).to_parquet(parquet)
+
+    get_dataframe.cache_clear()
+
+    assert get_dataframe(gz_file).to_dict("list") == {"a": [1], "b": [2]}
+    assert get_dataframe(io.BytesIO(gzip.compress(parquet.getvalue())))["x"].tolist() == [3, 4]
+
+
+def test_sheets_of_one_workbook_share_an_open_file(tmp_path, monkeypatch):
+    excel_file = tmp_path / "book.xlsx"
+    with pd.ExcelWriter(excel_file) as writer:
+        pd.DataFrame({"a": [1]}).to_excel(writer, sheet_name="one", index=False)
+        pd.DataFrame({"b": [2]}).to_excel(writer, sheet_name="two", index=False)
+
+    opened = []
+
+    class CountingExcelFile(pd.ExcelFile):
+        def __init__(self, path, **kwargs):
+            opened.append(path)
+            super().__init__(path, **kwargs)
+
+    monkeypatch.setattr(pd, "ExcelFile", CountingExcelFile)
+
+    get_dataframe.cache_clear()
+    one = get_dataframe(excel_file, sheet="one")
+    two = get_dataframe(excel_file, sheet="two")
+    get_dataframe.cache_clear()
+
+    assert one["a"].tolist() == [1]
+    assert two["b"].tolist() == [2]
+    assert len(opened) == 1
+
+
+def test_list_of_sheets_gives_dict_of_frames(tmp_path):
+    excel_file = tmp_path / "book.xlsx"
+    with pd.ExcelWriter(excel_file) as writer:
+        pd.DataFrame({"a": [1]}).to_excel(writer, sheet_name="one", index=False)
+        pd.DataFrame({"b": [2]}).to_excel(writer, sheet_name="two", index=False)
+
+    get_dataframe.cache_clear()
+    out = get_dataframe(excel_file, sheet=["one", "two"])
+    get_dataframe.cache_clear()
+
+    assert out["one"]["a"].tolist() == [1]
+    assert out["two"]["b"].tolist() == [2]
+
+
+def test_dtype_is_passed_to_text_readers(tmp_path):
+    csv_file = tmp_path / "codes.csv"
+    csv_file.write_text("code,n\n007,1\n010,2\n", encoding="utf-8")
+
+    get_dataframe.cache_clear()
+    inferred = get_dataframe(csv_file)
+    typed = get_dataframe(csv_file, dtype={"code": str})
+
+    assert inferred["code"].tolist() == [7, 10]
+    assert typed["code"].tolist() == ["007", "010"]
+    assert typed["n"].tolist() == [1, 2]
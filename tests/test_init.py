@@ -0,0 +1,13 @@
+import subprocess
+import sys
+
+
+def test_email_from_ligon_is_the_function_after_submodule_import():
+    # A fresh interpreter, so the submodule is imported before the export.
+    code = (
+        "from ligonlibrary.email_from_ligon import EmailContent\n"
+        "import ligonlibrary\n"
+        "assert ligonlibrary.email_from_ligon is sys.modules['ligonlibrary.email_from_ligon'].email_from_ligon\n"
+        "assert callable(ligonlibrary.email_from_ligon)\n"
+    )
+    subprocess.run([sys.executable, "-c", "import sys\n" + code], check=True)
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ligonlibrary.dataframes import normalize_strings
+
+
+def test_normalize_strings_normalizes_only_strings():
+    df = pd.DataFrame(
+        {
+            "name": ["  Jean-Luc  Picard", "jean luc picard", None],
+            "rank": [1, 2, 3],
+            "mixed": pd.Series(["A-B", 4, np.nan], dtype=object),
+        }
+    )
+
+    out = normalize_strings(df)
+
+    assert out["name"].tolist()[:2] == ["jean luc picard", "jean luc picard"]
+    assert pd.isna(out["name"].iloc[2])
+    assert out["rank"].tolist() == [1, 2, 3]
+    assert out["mixed"].tolist()[:2] == ["a b", 4]
+    assert pd.isna(out["mixed"].iloc[2])
+
+
+def test_normalize_strings_leaves_non_strings_alone():
+    mixed = pd.Series([1, True, 1.0, "A-b", False, 0, ["x"]], dtype=object)
+
+    out = normalize_strings(mixed)
+
+    assert out.tolist() == [1, True, 1.0, "a b", False, 0, ["x"]]
+    assert [type(v) for v in out] == [int, bool, float, str, bool, int, list]
+
+
+def test_normalize_strings_passes_case_option():
+    df = pd.DataFrame({"name": ["jean-luc picard"]})
+
+    out = normalize_strings(df, case="title")
+
+    assert out["name"].tolist() == ["Jean Luc Picard"]
+
+
+def test_normalize_strings_leaves_input_untouched():
+    df = pd.DataFrame({"name": ["A  B"]})
+
+    normalize_strings(df)
+
+    assert df["name"].tolist() == ["A  B"]
+
+
+def test_normalize_strings_keeps_column_dtypes():
+    df = pd.DataFrame(
+        {
+            "name": pd.Series(["A  B", "a b", "C"], dtype="string"),
+            "cat": pd.Series(["X-Y", "x y", "X-Y"], dtype="category"),
+            "value": [1.5, 2.5, 3.5],
+        }
+    )
+
+    out = normalize_strings(df)
+
+    assert out["name"].dtype == df["name"].dtype
+    assert out["name"].tolist() == ["a b", "a b", "c"]
+    assert out["cat"].tolist() == ["x y", "x y", "x y"]
+    assert out["value"].dtype == df["value"].dtype
+
+
+def test_normalize_strings_handles_arrow_strings():
+    pa = pytest.importorskip("pyarrow")
+    df = pd.DataFrame(
+        {
+            "name": pd.Series(["A  B", None, "C-D"], dtype=pd.ArrowDtype(pa.string())),
+            "value": pd.Series([1, 2, 3], dtype=pd.ArrowDtype(pa.int64())),
+        }
+    )
+
+    out = normalize_strings(df)
+
+    assert out["name"].dtype == df["name"].dtype
+    assert out["name"].tolist()[::2] == ["a b", "c d"]
+    assert out["name"].isna().tolist() == [False, True, False]
+    assert out["value"].tolist() == [1, 2, 3]
+
+
+@pytest.mark.parametrize("case", ["lower", "upper", "title", None])
+def test_normalize_strings_agrees_with_strings_normalized(case):
+    from ligonlibrary.strings import normalized
+
+    values = [" A\t-B\x0bC  ", "--x--", "Ab  Cd\n", "", " ", "Café  Ñandú", "o'neil 1st", "\x1cZ"]
+
+    out = normalize_strings(pd.Series(values, dtype=object), case=case)
+
+    assert out.tolist() == [normalized(v, case=case) for v in values]
@@ -1,5 +1,8 @@
 import importlib
+import json
+import os
 import sys
+from pathlib import Path
 
 import pandas as pd
 import pytest
@@ -44,3 +47,393 @@ def test_raw_sheet_to_df_single_header():
 
     assert list(df.columns) == ["col_a", "col_b"]
     assert df.iloc[0].tolist() == ["foo", "bar"]
+
+
+def test_read_sheets_fetches_all_worksheets_in_one_request(monkeypatch):
+    from ligonlibrary import sheets
+
+    class FakeWorksheet:
+        def __init__(self, title):
+            self.title = title
+
+        def get_all_values(self):
+            raise AssertionError("worksheets should not be fetched one at a time")
+
+    class FakeWorkbook:
+        def __init__(self):
+            self.requests = []
+
+        def worksheets(self):
+            return [FakeWorksheet("first"), FakeWorksheet("it's second")]
+
+        def values_batch_get(self, ranges):
+            self.requests.append(ranges)
+            return {
+                "valueRanges": [
+                    {"values": [["a", "b"], ["1", "2"], ["3"]]},
+                    {"values": [["c"], ["x"]]},
+                ]
+            }
+
+    workbook = FakeWorkbook()
+
+    class FakeClient:
+        def open_by_key(self, key):
+            return workbook
+
+    monkeypatch.setattr(sheets, "_authorize_clients", lambda json_creds: {"acct": FakeClient()})
+
+    out = sheets.read_sheets("key")
+
+    assert workbook.requests == [["'first'", "'it''s second'"]]
+    assert out["first"]["a"].tolist() == [1, 3]
+    assert out["first"]["b"].tolist()[0] == 2
+    assert out["it's second"]["c"].tolist() == ["x"]
+
+
+def test_authorize_clients_reuses_clients_until_key_changes(monkeypatch, tmp_path):
+    from ligonlibrary import sheets
+
+    key_file = tmp_path / "key.json"
+    key_file.write_text("{}")
+    calls = []
+
+    def authorize(json_creds):
+        calls.append(json_creds)
+        return {"acct": object()}
+
+    monkeypatch.setattr(sheets, "_authorize_uncached", authorize)
+    monkeypatch.setattr(sheets, "_CLIENT_CACHE", {})
+
+    first = sheets._authorize_clients(str(key_file))
+    again = sheets._authorize_clients(str(key_file))
+
+    assert again == first
+    assert len(calls) == 1
+
+    os.utime(key_file, ns=(0, 0))
+    sheets._authorize_clients(str(key_file))
+
+    assert len(calls) == 2
+
+
+def test_read_sheets_tries_the_account_that_worked_first(monkeypatch):
+    from ligonlibrary import sheets
+
+    opened = []
+
+    class FakeWorksheet:
+        title = "only"
+
+    class FakeWorkbook:
+        def worksheets(self):
+            return [FakeWorksheet()]
+
+        def values_batch_get(self, ranges):
+            return {"valueRanges": [{"values": [["a"], ["1"]]}]}
+
+    class FakeClient:
+        def __init__(self, name, allowed):
+            self.name = name
+            self.allowed = allowed
+
+        def open_by_key(self, key):
+            opened.append(self.name)
+            if not self.allowed:
+                raise PermissionError(key)
+            return FakeWorkbook()
+
+    clients = {"other": FakeClient("other", False), "owner": FakeClient("owner", True)}
+    monkeypatch.setattr(sheets, "_authorize_clients", lambda json_creds: clients)
+    monkeypatch.setattr(sheets, "_KEY_ACCOUNTS", {})
+
+    with pytest.warns(UserWarning):
+        sheets.read_sheets("key")
+    sheets.read_sheets("key")
+
+    assert opened == ["other", "owner", "owner"]
+
+
+def test_decrypt_credentials_asks_for_passphrase_once(monkeypatch, tmp_path):
+    from ligonlibrary import sheets
+
+    encrypted = tmp_path / "students.json.gpg"
+    encrypted.write_bytes(b"ciphertext")
+    prompts = []
+
+    class FakeStatus:
+        ok = True
+        data = b'{"client_email": "robot@example.com", "private_key": "k"}'
+
+    class FakeGPG:
+        def decrypt_file(self, handle, passphrase):
+            assert passphrase == "secret"
+            return FakeStatus()
+
+    monkeypatch.setattr(sheets.gnupg, "GPG", FakeGPG)
+    monkeypatch.setattr(sheets.getpass, "getpass", lambda prompt: prompts.append(prompt) or "secret")
+    sheets._decrypt_cached.cache_clear()
+
+    first = sheets.decrypt_credentials(str(encrypted), destination=tmp_path / "a")
+    second = sheets.decrypt_credentials(str(encrypted), destination=tmp_path / "b")
+
+    assert len(prompts) == 1
+    assert first.name == second.name == "robot@example.com"
+    assert json.loads(second.read_text())["private_key"] == "k"
+    sheets._decrypt_cached.cache_clear()
+
+
+def _api_error(status, headers=None):
+    import requests
+    from gspread.exceptions import APIError
+
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = json.dumps({"error": {"code": status, "message": "no", "status": "x"}}).encode()
+    return APIError(response)
+
+
+def test_with_backoff_retries_rate_limits(monkeypatch):
+    from ligonlibrary import sheets
+
+    sleeps = []
+    monkeypatch.setattr(sheets.time, "sleep", sleeps.append)
+    outcomes = [_api_error(429, {"Retry-After": "7"}), _api_error(503), "done"]
+
+    def flaky(x):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome + x
+
+    assert sheets._with_backoff(flaky, "!", base=0.5) == "done!"
+    assert sleeps[0] == 7.0
+    assert 1.0 <= sleeps[1] <= 1.5
+
+
+def test_with_backoff_does_not_retry_permission_errors(monkeypatch):
+    from gspread.exceptions import APIError
+
+    from ligonlibrary import sheets
+
+    monkeypatch.setattr(sheets.time, "sleep", lambda s: pytest.fail("should not sleep"))
+    calls = []
+
+    def forbidden():
+        calls.append(1)
+        raise _api_error(403)
+
+    with pytest.raises(APIError):
+        sheets._with_backoff(forbidden)
+    assert len(calls) == 1
+
+
+def _csv_response(body: bytes, status=200):
+    import gzip
+    import io
+
+    import requests
+    from urllib3 import HTTPResponse
+
+    response = requests.Response()
+    response.status_code = status
+    response.raw = HTTPResponse(
+        body=io.BytesIO(gzip.compress(body)),
+        headers={"Content-Encoding": "gzip"},
+        status=status,
+        preload_content=False,
+    )
+    return response
+
+
+def test_read_public_sheet_streams_gzipped_csv_without_blank_columns(monkeypatch):
+    from ligonlibrary import sheets
+
+    calls = []
+
+    def fake_get(url, headers, stream, timeout):
+        calls.append((url, headers, stream))
+        assert timeout == sheets._PUBLIC_SHEET_TIMEOUT
+        return _csv_response(b"a,,b,\n1,2,3,\n4,5,6,\n")
+
+    monkeypatch.setattr(sheets.requests, "get", fake_get)
+
+    df = sheets.read_public_sheet("https://docs.google.com/spreadsheets/d/KEY/edit", sheet=7)
+
+    assert calls[0][0] == "https://docs.google.com/spreadsheets/d/KEY/export?format=csv&gid=7"
+    assert "gzip" in calls[0][1]["Accept-Encoding"] and calls[0][2]
+    assert list(df.columns) == ["a", "b"]
+    assert df["b"].tolist() == [3, 6]
+
+
+def test_read_public_sheet_reports_missing_sheets(monkeypatch):
+    import requests
+
+    from ligonlibrary import sheets
+
+    monkeypatch.setattr(sheets.requests, "get", lambda *a, **k: _csv_response(b"", status=404))
+
+    with pytest.raises(requests.HTTPError, match="Check permissions"):
+        sheets.read_public_sheet("KEY")
+
+
+def test_get_credentials_loads_every_key_in_directory(tmp_path):
+    from ligonlibrary.sheets import get_credentials
+
+    for i in range(5):
+        (tmp_path / f"key{i}.json").write_text(json.dumps({"client_email": f"robot{i}@example.com"}))
+    (tmp_path / "nested").mkdir()
+
+    creds = get_credentials(tmp_path)
+
+    assert sorted(creds) == [f"robot{i}@example.com" for i in range(5)]
+    assert creds["robot3@example.com"]["client_email"] == "robot3@example.com"
+
+
+def test_get_credentials_decrypts_once_on_calling_thread(tmp_path, monkeypatch):
+    import threading
+
+    from ligonlibrary import sheets
+
+    for i in range(3):
+        (tmp_path / f"key{i}.json").write_text(json.dumps({"client_email": f"robot{i}@example.com"}))
+    unreadable = tmp_path / "broken.json"
+    unreadable.write_text("{}")
+    read_bytes = Path.read_bytes
+
+    def flaky_read_bytes(self):
+        if self == unreadable and not decrypted:
+            raise PermissionError(self)
+        return read_bytes(self)
+
+    decrypted = []
+
+    def decrypt(encrypted_key_file, destination):
+        decrypted.append((destination, threading.current_thread() is threading.main_thread()))
+        unreadable.write_text(json.dumps({"client_email": "fresh@example.com"}))
+
+    monkeypatch.setattr(Path, "read_bytes", flaky_read_bytes)
+    monkeypatch.setattr(sheets, "decrypt_credentials", decrypt)
+
+    creds = sheets.get_credentials(tmp_path)
+
+    assert decrypted == [(tmp_path, True)]
+    assert "fresh@example.com" in creds and len(creds) == 4
+
+
+def test_read_sheets_lists_worksheets_only_when_reading_all(monkeypatch):
+    from ligonlibrary import sheets
+
+    class FakeWorksheet:
+        title = "only"
+
+        def get_all_values(self):
+            return [["a"], ["1"]]
+
+    class FakeWorkbook:
+        def worksheets(self):
+            raise AssertionError("opening already checked permissions")
+
+        def worksheet(self, title):
+            return FakeWorksheet()
+
+    class FakeClient:
+        def open_by_key(self, key):
+            return FakeWorkbook()
+
+    monkeypatch.setattr(sheets, "_authorize_clients", lambda json_creds: {"acct": FakeClient()})
+
+    assert sheets.read_sheets("key", sheet="only")["a"].tolist() == [1]
+
+
+@pytest.mark.parametrize("sheet", ["My Sheet", None])
+def test_write_sheet_updates_all_cells_in_one_call(monkeypatch, sheet):
+    from ligonlibrary import sheets
+
+    updates = []
+    opened = []
+
+    class FakeWorksheet:
+        row_count = 2
+        col_count = 26
+
+        def resize(self, rows, cols):
+            self.row_count, self.col_count = rows, cols
+
+        def update(self, values, range_name, value_input_option):
+            updates.append((values, range_name, self.row_count))
+
+    class FakeSpread:
+        url = "https://docs.google.com/spreadsheets/d/KEY"
+
+        def __init__(self, key, creds):
+            self.sheet = FakeWorksheet()  # The first worksheet
+
+        def open_sheet(self, sheet, create=False):
+            assert sheet is not None
+            opened.append(sheet)
+            self.sheet = FakeWorksheet()
+
+        def df_to_sheet(self, *args, **kwargs):
+            raise AssertionError("cells should be written with a single update")
+
+    class FakeClient:
+        def insert_permission(self, *args, **kwargs):
+            pass
+
+    monkeypatch.setattr(sheets.Credentials, "from_service_account_file", lambda *a, **k: "creds")
+    monkeypatch.setattr(sheets.gspread, "authorize", lambda creds: FakeClient())
+    monkeypatch.setattr(sheets, "Spread", FakeSpread)
+
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", None]}, index=pd.Index(["r1", "r2"], name="id"))
+    assert sheets.write_sheet(df, "me@example.com", json_creds="key.json", key="KEY", sheet=sheet) == "KEY"
+
+    assert updates == [([["id", "a", "b"], ["r1", "1", "x"], ["r2", "2", ""]], "A1:C3", 3)]
+    assert opened == ([] if sheet is None else [sheet])
+
+
+def test_sheet_id_from_urls():
+    from ligonlibrary.sheets import _sheet_id
+
+    assert _sheet_id("https://docs.google.com/spreadsheets/d/1a-B_c/edit#gid=0") == "1a-B_c"
+    assert _sheet_id("https://docs.google.com/spreadsheets/d/1a-B_c") == "1a-B_c"
+    with pytest.raises(ValueError, match="Unrecognized sheet URL"):
+        _sheet_id("https://docs.google.com/spreadsheets/")
+
+
+def test_gspread_clients_share_one_connection_pool():
+    from google.oauth2.credentials import Credentials as UserCredentials
+
+    from ligonlibrary import sheets
+
+    first = sheets._gspread_client(UserCredentials("a"))
+    second = sheets._gspread_client(UserCredentials("b"))
+
+    def session(client):  # gspread >= 6 keeps its session on ``http_client``
+        return getattr(client, "http_client", client).session
+
+    adapter = session(first).get_adapter("https://sheets.googleapis.com")
+    assert adapter is sheets._HTTP_ADAPTER
+    assert session(second).get_adapter("https://www.googleapis.com") is adapter
+
+
+def test_numeric_columns_skips_text_columns_without_parsing(monkeypatch):
+    from ligonlibrary import sheets
+
+    parsed = []
+    to_numeric = sheets.to_numeric
+
+    def counting(column):
+        parsed.append(column.name)
+        return to_numeric(column)
+
+    monkeypatch.setattr(sheets, "to_numeric", counting)
+    df = pd.DataFrame({"name": ["Ann", "Bo"], "x": ["1", "2.5"], "gap": ["", "3"], "mixed": ["4", "n/a"]})
+
+    out = sheets._numeric_columns(df)
+
+    assert parsed == ["x", "gap", "mixed"]
+    assert out["x"].tolist() == [1.0, 2.5]
+    assert out["gap"].tolist()[1] == 3
+    assert out["mixed"].tolist() == ["4", "n/a"]